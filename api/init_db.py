@@ -1,13 +1,77 @@
 """
 Script to initialize/update the database with all tables.
 Run this if you get errors about missing tables.
+
+create_all() leaves existing tables alone, so index changes made in models.py
+are also applied here: new indexes are created and retired ones dropped, and on
+PostgreSQL json columns that models.py now maps to JSONB are converted.
+Safe to re-run; the release phase runs it on every deploy.
 """
 
 from app import app, db
+from sqlalchemy import text
+from sqlalchemy.schema import CreateIndex
+
+# (table, index) pairs declared in models.py after their table first shipped
+ADDED_INDEXES = [
+    ("test_results", "idx_tr_participant_status"),
+    ("screening_recommended_tests", "idx_srt_session_position"),
+    ("color_trials", "idx_ct_participant_stimulus_trial"),
+    ("tests", "idx_tests_lower_name"),
+]
+
+# Indexes models.py no longer declares
+DROPPED_INDEXES = [
+    # Covered by idx_srt_session_position
+    "ix_screening_recommended_tests_session_id",
+    # Prefix of the idx_ct_participant_* composites
+    "ix_color_trials_participant_id",
+    # Nothing reads screening events by time
+    "ix_screening_events_created_at",
+]
+
+# (table, column) pairs models.py stores as JSONB on PostgreSQL
+JSONB_COLUMNS = [
+    ("screening_sessions", "selected_types"),
+    ("screening_sessions", "recommended_tests"),
+    ("screening_events", "details"),
+    ("color_trials", "meta_json"),
+]
 
 with app.app_context():
     print("Creating all database tables...")
     db.create_all()
+
+    print("Syncing indexes on existing tables...")
+    with db.engine.begin() as connection:
+        for table_name, index_name in ADDED_INDEXES:
+            table = db.metadata.tables[table_name]
+            index = next(ix for ix in table.indexes if ix.name == index_name)
+            # IF NOT EXISTS: checkfirst reflection can't see expression indexes
+            connection.execute(CreateIndex(index, if_not_exists=True))
+        for index_name in DROPPED_INDEXES:
+            connection.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+
+        if connection.dialect.name == "postgresql":
+            print("Converting json columns to jsonb...")
+            for table_name, column_name in JSONB_COLUMNS:
+                data_type = connection.scalar(
+                    text(
+                        "SELECT data_type FROM information_schema.columns"
+                        " WHERE table_schema = current_schema()"
+                        " AND table_name = :table AND column_name = :column"
+                    ),
+                    {"table": table_name, "column": column_name},
+                )
+                # Only still-json columns: the ALTER rewrites the whole table
+                if data_type == "json":
+                    connection.execute(
+                        text(
+                            f"ALTER TABLE {table_name} ALTER COLUMN {column_name}"
+                            f" TYPE jsonb USING {column_name}::jsonb"
+                        )
+                    )
+
     print("✓ Database initialized successfully!")
     print("\nTables created:")
     from sqlalchemy import inspect
@@ -1,12 +1,16 @@
 from datetime import datetime, timezone
 from flask_sqlalchemy import SQLAlchemy
 import enum
-from sqlalchemy import CheckConstraint, Index
+from sqlalchemy import CheckConstraint, Index, func
+from sqlalchemy.dialects.postgresql import JSONB
 import math
 from uuid import uuid4
 
 db = SQLAlchemy()
 
+# JSON documents stored pre-parsed as JSONB on PostgreSQL; plain JSON elsewhere
+_JSON_DOC = db.JSON().with_variant(JSONB(), "postgresql")
+
 # ======================================================
 # CORE USER & TEST MODELS (existing)
 # ======================================================
@@ -81,10 +85,18 @@ class Test(db.Model):
         return f"<Test {self.name}>"
 
 
+# Recommendations resolve test names case-insensitively via lower(name)
+Index("idx_tests_lower_name", func.lower(Test.name))
+
+
 class TestResult(db.Model):
     """Model for test results"""
 
     __tablename__ = "test_results"
+    __table_args__ = (
+        # Dashboard counts a participant's results by status
+        Index("idx_tr_participant_status", "participant_id", "status"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     participant_id = db.Column(
@@ -175,10 +187,10 @@ class ScreeningSession(db.Model):
     # derived outcome
     eligible = db.Column(db.Boolean, nullable=True)
     selected_types = db.Column(
-        db.JSON, nullable=True
+        _JSON_DOC, nullable=True
     )  # e.g., ["Grapheme – Color", "Lexical – Taste"]
     recommended_tests = db.Column(
-        db.JSON, nullable=True
+        _JSON_DOC, nullable=True
     )  # list of dicts: {name, reason, test_id?}
 
     started_at = db.Column(db.DateTime, default=datetime.now(timezone.utc), index=True)
@@ -237,8 +249,10 @@ class ScreeningSession(db.Model):
     # ---------------- Convenience helpers ----------------
 
     def record_event(self, step: int, event: str, details: dict | None = None):
-        self.events.append(
-            ScreeningEvent(step=step, event=event, details=details or {})
+        # Set the many-to-one side: appending to self.events would first load
+        # every earlier event of the session just to add one row.
+        db.session.add(
+            ScreeningEvent(session=self, step=step, event=event, details=details or {})
         )
         return self
 
@@ -250,15 +264,22 @@ class ScreeningSession(db.Model):
             RecommendationService,
         )
 
-        # Use services instead of direct method calls
-        EligibilityService.compute_eligibility_and_exit(self)
-        if self.eligible:
-            RecommendationService.compute_recommendations(self)
-            self.status = "completed"
-        else:
-            self.status = "exited"
-        if not self.completed_at:
-            self.completed_at = datetime.now(timezone.utc)
+        # Flush whatever the caller left pending (this session, new Test rows)
+        # before autoflush is switched off, so the recommendation lookup still
+        # sees it.
+        db.session.flush()
+        # Use services instead of direct method calls. The recommendation
+        # queries would otherwise autoflush the outcome fields early, costing
+        # a second UPDATE of this row; hold every change for the caller's commit.
+        with db.session.no_autoflush:
+            EligibilityService.compute_eligibility_and_exit(self)
+            if self.eligible:
+                RecommendationService.compute_recommendations(self)
+                self.status = "completed"
+            else:
+                self.status = "exited"
+            if not self.completed_at:
+                self.completed_at = datetime.now(timezone.utc)
 
 
 class ScreeningHealth(db.Model):
@@ -354,9 +375,10 @@ class ScreeningEvent(db.Model):
     event = db.Column(
         db.String(64), nullable=False
     )  # e.g., 'consent_checked', 'continue', 'exit'
-    details = db.Column(db.JSON, nullable=True)
+    details = db.Column(_JSON_DOC, nullable=True)
 
-    created_at = db.Column(db.DateTime, default=datetime.now(timezone.utc), index=True)
+    # Write-only audit rows: nothing reads events by time, so no index to maintain
+    created_at = db.Column(db.DateTime, default=datetime.now(timezone.utc))
 
     def __repr__(self):
         return f"<ScreeningEvent S={self.session_id} step={self.step} {self.event}>"
@@ -366,10 +388,15 @@ class ScreeningRecommendedTest(db.Model):
     """Normalized list of suggested tests for a finished, eligible session."""
 
     __tablename__ = "screening_recommended_tests"
+    __table_args__ = (
+        # Recommendations are always read per session in position order;
+        # also serves plain session_id lookups
+        Index("idx_srt_session_position", "session_id", "position"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     session_id = db.Column(
-        db.Integer, db.ForeignKey("screening_sessions.id"), nullable=False, index=True
+        db.Integer, db.ForeignKey("screening_sessions.id"), nullable=False
     )
 
     position = db.Column(db.Integer, nullable=False)  # 1-based order shown to the user
@@ -381,7 +408,8 @@ class ScreeningRecommendedTest(db.Model):
     test_id = db.Column(
         db.Integer, db.ForeignKey("tests.id"), nullable=True, index=True
     )
-    test = db.relationship("Test", lazy="joined")
+    # Not eager: most rec loads only need the name; readers of .test joinedload it
+    test = db.relationship("Test", lazy=True)
 
     created_at = db.Column(db.DateTime, default=datetime.now(timezone.utc))
 
@@ -393,6 +421,19 @@ class ScreeningRecommendedTest(db.Model):
 # COLOR TEST MODELS (IMPROVED & COMPLETE)
 # ======================================================
 
+# Two-digit hex for every 0..255 channel; stimulus listings format many colors
+_BYTE_HEX = tuple(f"{i:02x}" for i in range(256))
+
+
+def _rgb_hex(r, g, b):
+    """'#rrggbb' for 0..255 channels, formatting anything else as before"""
+    try:
+        if r >= 0 and g >= 0 and b >= 0:
+            return "#" + _BYTE_HEX[r] + _BYTE_HEX[g] + _BYTE_HEX[b]
+    except (IndexError, TypeError):
+        pass
+    return f"#{r:02x}{g:02x}{b:02x}"
+
 
 class ColorStimulus(db.Model):
     """Stimuli table for color-based tests"""
@@ -449,7 +490,7 @@ class ColorStimulus(db.Model):
     @property
     def hex_color(self):
         """Returns the color as a hex string"""
-        return f"#{self.r:02x}{self.g:02x}{self.b:02x}"
+        return _rgb_hex(self.r, self.g, self.b)
 
     @property
     def rgb_tuple(self):
@@ -494,13 +535,21 @@ class ColorTrial(db.Model):
         CheckConstraint("response_ms >= 0", name="check_response_time_positive"),
         Index("idx_ct_participant_created", "participant_id", "created_at"),
         Index("idx_ct_stimulus_trial", "stimulus_id", "trial_index"),
+        # Analysis lists one participant's trials by stimulus, then trial order
+        Index(
+            "idx_ct_participant_stimulus_trial",
+            "participant_id",
+            "stimulus_id",
+            "trial_index",
+        ),
     )
 
     id = db.Column(db.Integer, primary_key=True)
 
     # Foreign key to Participant - using string for now to match your current schema
     # You can change this to Integer + ForeignKey later if needed
-    participant_id = db.Column(db.String(64), nullable=False, index=True)
+    # Prefix of the composite indexes above; no single-column index needed
+    participant_id = db.Column(db.String(64), nullable=False)
 
     # Foreign key to ColorStimulus
     stimulus_id = db.Column(
@@ -521,7 +570,7 @@ class ColorTrial(db.Model):
     response_ms = db.Column(db.Integer, nullable=True)
 
     # Metadata (device info, browser, etc.)
-    meta_json = db.Column(db.JSON, nullable=True)
+    meta_json = db.Column(_JSON_DOC, nullable=True)
 
     created_at = db.Column(db.DateTime, default=datetime.now(timezone.utc), index=True)
 
@@ -534,7 +583,7 @@ class ColorTrial(db.Model):
         if all(
             v is not None for v in [self.selected_r, self.selected_g, self.selected_b]
         ):
-            return f"#{self.selected_r:02x}{self.selected_g:02x}{self.selected_b:02x}"
+            return _rgb_hex(self.selected_r, self.selected_g, self.selected_b)
         return None
 
     @property
@@ -1,7 +1,10 @@
 # services.py — Business logic services for screening
 # Separates business logic from data models following SOLID principles
 
+from sqlalchemy import delete, func, insert, select
+
 from models import (
+    db,
     YesNo,
     YesNoMaybe,
     Frequency,
@@ -10,6 +13,24 @@ from models import (
 )
 
 
+# type_choice attribute -> canonical label, in the order labels are reported
+_TYPE_LABELS = (
+    ("grapheme", "Grapheme – Color"),
+    ("music", "Music – Color"),
+    ("lexical", "Lexical – Taste"),
+    ("sequence", "Sequence – Space"),
+)
+_SELECTED_FREQUENCIES = frozenset((Frequency.yes, Frequency.sometimes))
+
+# Selected type label -> Test.name it recommends; other labels pass through as-is
+_TEST_NAME_FOR_LABEL = {
+    "Grapheme – Color": "Grapheme-Color",
+    "Music – Color": "Music-Color",
+    "Lexical – Taste": "Lexical-Gustatory",
+    "Sequence – Space": "Sequence-Space",
+}
+
+
 class TypeSelectionService:
     """Service for computing selected types from type choices."""
 
@@ -18,18 +39,14 @@ class TypeSelectionService:
         """
         Build a canonical list from type_choice (yes/sometimes only).
         """
-        out = []
         tc = session.type_choice
         if not tc:
-            return out
-        if tc.grapheme in {Frequency.yes, Frequency.sometimes}:
-            out.append("Grapheme – Color")
-        if tc.music in {Frequency.yes, Frequency.sometimes}:
-            out.append("Music – Color")
-        if tc.lexical in {Frequency.yes, Frequency.sometimes}:
-            out.append("Lexical – Taste")
-        if tc.sequence in {Frequency.yes, Frequency.sometimes}:
-            out.append("Sequence – Space")
+            return []
+        out = [
+            label
+            for attr, label in _TYPE_LABELS
+            if getattr(tc, attr) in _SELECTED_FREQUENCIES
+        ]
         if tc.other and tc.other.strip():
             out.append(f"Other: {tc.other.strip()}")
         return out
@@ -59,13 +76,13 @@ class EligibilityService:
             return
 
         # Definition (step 2)
-        if session.definition and session.definition.answer == YesNoMaybe.no:
+        if session.definition and session.definition.answer is YesNoMaybe.no:
             session.eligible = False
             session.exit_code = "A"
             return
 
         # Pain & Emotion (step 3)
-        if session.pain_emotion and session.pain_emotion.answer == YesNo.yes:
+        if session.pain_emotion and session.pain_emotion.answer is YesNo.yes:
             session.eligible = False
             session.exit_code = "D"
             return
@@ -92,35 +109,60 @@ class RecommendationService:
         Derive recommended tests from selected_types.
         Stores JSON and fills normalized table. If a Test exists by name, link it.
         """
-        mapping = {
-            "Grapheme – Color": "Grapheme-Color",
-            "Music – Color": "Music-Color",
-            "Lexical – Taste": "Lexical-Gustatory",
-            "Sequence – Space": "Sequence-Space",
-        }
+        labels = session.selected_types or []
+        base_names = [_TEST_NAME_FOR_LABEL.get(label, label) for label in labels]
+
+        # Resolve every name in one round-trip; names match case-insensitively
+        # and the lowest id wins when several tests share a name.
+        test_ids = {}
+        if base_names:
+            rows = db.session.execute(
+                select(Test.id, Test.name)
+                .where(
+                    func.lower(Test.name).in_(sorted({n.lower() for n in base_names}))
+                )
+                .order_by(Test.id)
+            )
+            for test_id, name in rows:
+                test_ids.setdefault(name.lower(), test_id)
 
         results = []
-        # Clear existing rows if recomputing
-        session.recs.clear()
-
-        for idx, label in enumerate(session.selected_types or []):
-            base_name = mapping.get(label, label)  # fallback
-            reason = f"Selected type: {label}"
-            test_row = Test.query.filter(Test.name.ilike(base_name)).first()
-            rec = ScreeningRecommendedTest(
-                position=idx + 1,
-                suggested_name=base_name,
-                reason=reason,
-                test_id=test_row.id if test_row else None,
-            )
-            session.recs.append(rec)
+        for idx, (label, base_name) in enumerate(zip(labels, base_names)):
             results.append(
                 {
                     "position": idx + 1,
                     "name": base_name,
-                    "reason": reason,
-                    "test_id": test_row.id if test_row else None,
+                    "reason": f"Selected type: {label}",
+                    "test_id": test_ids.get(base_name.lower()),
                 }
             )
 
+        # Replace any previous rows with one DELETE and one executemany INSERT
+        # rather than loading recs and flushing each row through the collection.
+        # Both key on session.id, so a pending session (e.g. when called under
+        # no_autoflush) is flushed first to get one.
+        if session.id is None:
+            db.session.flush()
+        db.session.execute(
+            delete(ScreeningRecommendedTest).where(
+                ScreeningRecommendedTest.session_id == session.id
+            )
+        )
+        if results:
+            db.session.execute(
+                insert(ScreeningRecommendedTest),
+                [
+                    {
+                        "session_id": session.id,
+                        "position": r["position"],
+                        "suggested_name": r["name"],
+                        "reason": r["reason"],
+                        "test_id": r["test_id"],
+                    }
+                    for r in results
+                ],
+            )
+        # Reload recs from the new rows on next access
+        db.session.expire(session, ["recs"])
+
         session.recommended_tests = results
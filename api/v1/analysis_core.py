@@ -5,8 +5,9 @@ Pure Python business logic with no Flask or database dependencies.
 This module contains all testable analysis functions that can achieve 100% coverage.
 """
 
-from math import pow, sqrt
+from math import dist, pow
 from collections import defaultdict
+from functools import lru_cache
 from statistics import mean, median
 
 
@@ -18,13 +19,24 @@ def srgb_channel_to_linear(c):
     return pow((c + 0.055) / 1.055, 2.4)
 
 
+# Linear value for every 8-bit sRGB channel, so stored trial colours skip pow()
+_SRGB_U8_TO_LINEAR = tuple(srgb_channel_to_linear(i / 255.0) for i in range(256))
+
+
+def channel255_to_linear(c):
+    """Convert a single sRGB channel in 0..255 to linear value."""
+    if type(c) is int and 0 <= c <= 255:
+        return _SRGB_U8_TO_LINEAR[c]
+    return srgb_channel_to_linear(c / 255.0)
+
+
 def rgb255_to_linear(rgb):
     """Convert (r,g,b) in 0..255 to linear RGB in 0..1."""
     r, g, b = rgb
     return (
-        srgb_channel_to_linear(r / 255.0),
-        srgb_channel_to_linear(g / 255.0),
-        srgb_channel_to_linear(b / 255.0),
+        channel255_to_linear(r),
+        channel255_to_linear(g),
+        channel255_to_linear(b),
     )
 
 
@@ -39,10 +51,26 @@ def linear_rgb_to_xyz(r_lin, g_lin, b_lin):
 # Reference white D65 (Xn, Yn, Zn)
 _D65 = (0.95047, 1.00000, 1.08883)
 
+# L* switches from the cube root to a linear slope below this Y/Yn
+_LUV_EPSILON = pow(6.0 / 29.0, 3)
+_LUV_KAPPA = (29.0 / 3.0) ** 3
+
+
+def _white_uv(white):
+    """u', v' chromaticity of a reference white."""
+    Xn, Yn, Zn = white
+    denom_n = Xn + 15 * Yn + 3 * Zn
+    if denom_n == 0:
+        return 0.0, 0.0
+    return (4 * Xn) / denom_n, (9 * Yn) / denom_n
+
+
+_D65_UV = _white_uv(_D65)
+
 
 def xyz_to_luv(X, Y, Z, white=_D65):
     """Convert XYZ to CIELUV (L*, u*, v*)."""
-    Xn, Yn, Zn = white
+    Yn = white[1]
     denom = X + 15 * Y + 3 * Z
     if denom == 0:
         u_p = v_p = 0.0
@@ -50,19 +78,15 @@ def xyz_to_luv(X, Y, Z, white=_D65):
         u_p = (4 * X) / denom
         v_p = (9 * Y) / denom
 
-    denom_n = Xn + 15 * Yn + 3 * Zn
-    if denom_n == 0:
-        u_p_n = v_p_n = 0.0
-    else:
-        u_p_n = (4 * Xn) / denom_n
-        v_p_n = (9 * Yn) / denom_n
+    # The default white is fixed, so its chromaticity is computed once
+    u_p_n, v_p_n = _D65_UV if white is _D65 else _white_uv(white)
 
     yr = Y / Yn if Yn != 0 else 0
     # L* computation
-    if yr > pow(6.0 / 29.0, 3):
+    if yr > _LUV_EPSILON:
         L_star = 116.0 * pow(yr, 1.0 / 3.0) - 16.0
     else:
-        L_star = (29.0 / 3.0) ** 3 * yr
+        L_star = _LUV_KAPPA * yr
 
     u = 13.0 * L_star * (u_p - u_p_n)
     v = 13.0 * L_star * (v_p - v_p_n)
@@ -80,15 +104,24 @@ def hex_to_rgb(hexstr):
     """Convert a hex color like '#ff00aa' or 'f0a' to an (r,g,b) tuple or None."""
     if not hexstr:
         return None
-    s = str(hexstr).lstrip("#")
+    # str() keeps the cache key hashable whatever the payload held
+    return _hex_to_rgb(str(hexstr))
+
+
+@lru_cache(maxsize=512)
+def _hex_to_rgb(hexstr):
+    """Decode a non-empty hex string; cached since studies reuse a small palette."""
+    s = hexstr.lstrip("#")
     if len(s) == 3:
-        s = "".join([c * 2 for c in s])
-    if len(s) != 6:
+        s = s[0] * 2 + s[1] * 2 + s[2] * 2
+    elif len(s) != 6:
         return None
     try:
-        return (int(s[0:2], 16), int(s[2:4], 16), int(s[4:6], 16))
-    except Exception:
+        # one C-level decode; unpacking also rejects whitespace-padded input
+        r, g, b = bytes.fromhex(s)
+    except ValueError:
         return None
+    return (r, g, b)
 
 
 def trial_rgb_or_none(t):
@@ -100,16 +133,17 @@ def trial_rgb_or_none(t):
     client payload shapes.
     """
     # direct columns
-    if all(v is not None for v in [t.selected_r, t.selected_g, t.selected_b]):
-        return (int(t.selected_r), int(t.selected_g), int(t.selected_b))
+    r, g, b = t.selected_r, t.selected_g, t.selected_b
+    if r is not None and g is not None and b is not None:
+        return (int(r), int(g), int(b))
 
-    meta = t.meta_json or {}
+    meta = t.meta_json
+    if not meta:
+        return None
+    get = meta.get
     # common hex fields
     hexc = (
-        meta.get("selected_hex")
-        or meta.get("color_hex")
-        or meta.get("hex")
-        or meta.get("selectedColorHex")
+        get("selected_hex") or get("color_hex") or get("hex") or get("selectedColorHex")
     )
     if hexc:
         rgb = hex_to_rgb(hexc)
@@ -117,30 +151,12 @@ def trial_rgb_or_none(t):
             return rgb
 
     # nested selected_color or selectedColor objects
-    sc = meta.get("selected_color") or meta.get("selectedColor") or meta.get("color")
+    sc = get("selected_color") or get("selectedColor") or get("color")
     if isinstance(sc, dict):
         try:
-            r = (
-                sc.get("r")
-                if sc.get("r") is not None
-                else sc.get("R")
-                if sc.get("R") is not None
-                else sc.get("red")
-            )
-            g = (
-                sc.get("g")
-                if sc.get("g") is not None
-                else sc.get("G")
-                if sc.get("G") is not None
-                else sc.get("green")
-            )
-            b = (
-                sc.get("b")
-                if sc.get("b") is not None
-                else sc.get("B")
-                if sc.get("B") is not None
-                else sc.get("blue")
-            )
+            r = _first_not_none(sc, ("r", "R", "red"))
+            g = _first_not_none(sc, ("g", "G", "green"))
+            b = _first_not_none(sc, ("b", "B", "blue"))
             if r is not None and g is not None and b is not None:
                 return (int(r), int(g), int(b))
         except Exception:
@@ -149,9 +165,18 @@ def trial_rgb_or_none(t):
     return None
 
 
+def _first_not_none(d, keys):
+    """Value of the first key in keys that d holds a non-None value for."""
+    for key in keys:
+        value = d.get(key)
+        if value is not None:
+            return value
+    return None
+
+
 def luv_distance(a, b):
     """Euclidean distance between two Luv triples."""
-    return sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2)
+    return dist(a, b)
 
 
 def mean_pairwise_distance(triples):
@@ -161,9 +186,10 @@ def mean_pairwise_distance(triples):
     """
     if len(triples) != 3:
         raise ValueError("Need exactly 3 samples to compute pairwise distances")
-    d12 = luv_distance(triples[0], triples[1])
-    d23 = luv_distance(triples[1], triples[2])
-    d31 = luv_distance(triples[2], triples[0])
+    p1, p2, p3 = triples
+    d12 = dist(p1, p2)
+    d23 = dist(p2, p3)
+    d31 = dist(p3, p1)
     return (d12 + d23 + d31) / 3.0, dict(d12=d12, d23=d23, d31=d31)
 
 
@@ -221,8 +247,11 @@ def analyze_participant_logic(
         # Consider only the first three ordered by trial_index
         trs_sorted = sorted(trs, key=lambda x: x.trial_index or 0)[:3]
 
+        # Resolve each trial's RGB once; it is reused for the Luv conversion
+        rgbs = [trial_rgb_or_none(t) for t in trs_sorted]
+
         # Check no_color: treat as no_color if any trial lacks an RGB sample
-        missing_rgb_trials = [t.id for t in trs_sorted if trial_rgb_or_none(t) is None]
+        missing_rgb_trials = [t.id for t, rgb in zip(trs_sorted, rgbs) if rgb is None]
         if missing_rgb_trials:
             none_counts += 1
             per_trigger[str(key)] = {
@@ -233,18 +262,12 @@ def analyze_participant_logic(
             continue
 
         # Convert to Luv
-        luvs = []
-        mean_r = mean_g = mean_b = 0
-        for t in trs_sorted:
-            rgb = trial_rgb_or_none(t)
-            luv = rgb255_to_luv(rgb)
-            luvs.append(luv)
-            if t.response_ms is not None:
-                rt_list.append(t.response_ms)
-            # accumulate RGB (they are ints)
-            mean_r += rgb[0] if rgb is not None else 0
-            mean_g += rgb[1] if rgb is not None else 0
-            mean_b += rgb[2] if rgb is not None else 0
+        luvs = [rgb255_to_luv(rgb) for rgb in rgbs]
+        rt_list.extend(t.response_ms for t in trs_sorted if t.response_ms is not None)
+        # accumulate RGB (they are ints)
+        mean_r = sum(rgb[0] for rgb in rgbs)
+        mean_g = sum(rgb[1] for rgb in rgbs)
+        mean_b = sum(rgb[2] for rgb in rgbs)
 
         mean_d, pairwise = mean_pairwise_distance(luvs)
         per_trigger[str(key)] = {
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify, session
 from models import db, ColorTrial, Participant
+from sqlalchemy import insert
 from datetime import datetime, timezone
 from .analysis import analyze_participant
 
@@ -68,7 +69,7 @@ def save_color_trials_batch():
         if not participant:
             return jsonify({"error": "Participant not found"}), 404
 
-        trials = []
+        rows = []
         test_type = None  # Infer from meta_json if not explicitly provided
 
         for trial_data in trials_data:
@@ -78,19 +79,26 @@ def save_color_trials_batch():
                 if meta:
                     test_type = meta.get("test_type")
 
-            trial = ColorTrial(
-                participant_id=participant.participant_id,
-                # stimulus_id removed - stimulus info is stored in meta_json
-                trial_index=trial_data.get("trial_index"),
-                selected_r=trial_data.get("selected_r"),
-                selected_g=trial_data.get("selected_g"),
-                selected_b=trial_data.get("selected_b"),
-                response_ms=trial_data.get("response_ms"),
-                meta_json=trial_data.get("meta_json", {}),
+            rows.append(
+                {
+                    "participant_id": participant.participant_id,
+                    # stimulus_id removed - stimulus info is stored in meta_json
+                    "trial_index": trial_data.get("trial_index"),
+                    "selected_r": trial_data.get("selected_r"),
+                    "selected_g": trial_data.get("selected_g"),
+                    "selected_b": trial_data.get("selected_b"),
+                    "response_ms": trial_data.get("response_ms"),
+                    "meta_json": trial_data.get("meta_json", {}),
+                }
             )
-            trials.append(trial)
-            db.session.add(trial)
 
+        # One multi-row INSERT (insertmanyvalues) returning ids in request order
+        trial_ids = []
+        if rows:
+            stmt = insert(ColorTrial).returning(
+                ColorTrial.id, sort_by_parameter_order=True
+            )
+            trial_ids = db.session.scalars(stmt, rows).all()
         db.session.commit()
 
         # Automatically run analysis for this participant (groups all trials by stimulus/trigger)
@@ -112,8 +120,8 @@ def save_color_trials_batch():
             jsonify(
                 {
                     "success": True,
-                    "count": len(trials),
-                    "trial_ids": [t.id for t in trials],
+                    "count": len(trial_ids),
+                    "trial_ids": trial_ids,
                     "analysis": analysis_result,  # Include analysis result in response
                 }
             ),
@@ -1,15 +1,24 @@
 from flask import Blueprint, jsonify, session
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import joinedload
 from models import (
+    db,
     Participant,
     Researcher,
     ScreeningSession,
     ScreeningRecommendedTest,
     TestResult,
-    Test,
 )
 
 bp = Blueprint("dashboard", __name__)
 
+PENDING_STATUSES = ("not_started", "in_progress")
+
+
+def _count_where(condition):
+    """SUM(CASE ...) counting the rows that match condition; 0 when there are none"""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
 
 @bp.route("", methods=["GET"])
 def get_dashboard_data():
@@ -41,74 +50,82 @@ def get_dashboard_data():
         recommended_tests = []
         screening_completed = False
         if role == "participant":
-            # Find the latest completed screening session
-            latest_screening = (
-                ScreeningSession.query.filter_by(participant_id=user_id, eligible=True)
+            # Latest eligible screening session, as a subquery
+            latest_screening_id = (
+                select(ScreeningSession.id)
+                .filter_by(participant_id=user_id, eligible=True)
                 .order_by(ScreeningSession.completed_at.desc())
-                .first()
+                .limit(1)
+                .scalar_subquery()
             )
+            # One round trip for the session's status and its recommendations
+            # (ordered by position, with each rec's Test joined in).
+            # The outer join yields a single (status, None) row when it has none.
+            rows = db.session.execute(
+                select(ScreeningSession.status, ScreeningRecommendedTest)
+                .outerjoin(
+                    ScreeningRecommendedTest,
+                    ScreeningRecommendedTest.session_id == ScreeningSession.id,
+                )
+                .where(ScreeningSession.id == latest_screening_id)
+                .order_by(ScreeningRecommendedTest.position)
+                .options(joinedload(ScreeningRecommendedTest.test))
+            ).all()
 
             # Check if screening is completed (either from participant flag or latest screening session)
             screening_completed = user.screening_completed or (
-                latest_screening
-                and latest_screening.status == "completed"
-                and latest_screening.eligible
+                rows[0].status == "completed" if rows else None
             )
 
-            if latest_screening:
-                # Get recommended tests from normalized table, ordered by position
-                recs = (
-                    ScreeningRecommendedTest.query.filter_by(
-                        session_id=latest_screening.id
+            # Build recommended tests list with test details if available
+            for _, rec in rows:
+                if rec is None:
+                    continue
+                test_info = {
+                    "name": rec.suggested_name,
+                    "reason": rec.reason,
+                    "test_id": rec.test_id,
+                }
+                test = rec.test
+                if test:
+                    test_info.update(
+                        {
+                            "id": test.id,
+                            "description": test.description,
+                            "synesthesia_type": test.synesthesia_type,
+                            "duration": test.duration,
+                        }
                     )
-                    .order_by(ScreeningRecommendedTest.position)
-                    .all()
-                )
-
-                # Build recommended tests list with test details if available
-                for rec in recs:
-                    test_info = {
-                        "name": rec.suggested_name,
-                        "reason": rec.reason,
-                        "test_id": rec.test_id,
-                    }
-                    # If test_id exists, fetch test details
-                    if rec.test_id:
-                        test = Test.query.get(rec.test_id)
-                        if test:
-                            test_info.update(
-                                {
-                                    "id": test.id,
-                                    "description": test.description,
-                                    "synesthesia_type": test.synesthesia_type,
-                                    "duration": test.duration,
-                                }
-                            )
-                    recommended_tests.append(test_info)
+                recommended_tests.append(test_info)
 
         # Count test results for participant
         tests_completed = 0
         tests_pending = 0
         if role == "participant":
-            test_results = TestResult.query.filter_by(participant_id=user_id).all()
-            completed_results = [tr for tr in test_results if tr.status == "completed"]
-            tests_completed = len(completed_results)
-            tests_pending = len(
-                [
-                    tr
-                    for tr in test_results
-                    if tr.status in ["not_started", "in_progress"]
-                ]
-            )
+            # Both counts in one aggregate instead of loading every TestResult
+            tests_completed, tests_pending = db.session.execute(
+                select(
+                    _count_where(TestResult.status == "completed"),
+                    _count_where(TestResult.status.in_(PENDING_STATUSES)),
+                ).where(TestResult.participant_id == user_id)
+            ).one()
             # Add pending tests from recommendations if not started
-            if recommended_tests:
-                for rec in recommended_tests:
-                    if rec.get("test_id"):
-                        existing = TestResult.query.filter_by(
-                            participant_id=user_id, test_id=rec.get("test_id")
-                        ).first()
-                        if not existing:
-                            tests_pending += 1
+            rec_test_ids = [
+                rec["test_id"] for rec in recommended_tests if rec.get("test_id")
+            ]
+            if rec_test_ids:
+                # One lookup for every recommended test instead of one per rec
+                started = set(
+                    db.session.scalars(
+                        select(TestResult.test_id).where(
+                            TestResult.participant_id == user_id,
+                            TestResult.test_id.in_(rec_test_ids),
+                        )
+                    )
+                )
+                tests_pending += sum(
+                    1 for test_id in rec_test_ids if test_id not in started
+                )
 
         total_tests = tests_completed + tests_pending
         completion_percentage = (
@@ -1,6 +1,7 @@
 # views.py
 from datetime import datetime, timezone
 from flask import Blueprint, request, jsonify, session
+from sqlalchemy.orm import joinedload
 from models import (
     db,
     Participant,
@@ -17,6 +18,9 @@ from models import (
 # Expose this Blueprint as `api_screening` for app.py to import
 bp = Blueprint("screening", __name__)
 
+# Step 4 frequency fields, named the same in the request body and on the model
+_TYPE_CHOICE_FIELDS = ("grapheme", "music", "lexical", "sequence")
+
 
 # ---------------------------
 # Helpers (dev-safe stubs)
@@ -65,11 +69,13 @@ def _current_participant_id():
         raise
 
 
-def _get_or_create_session():
+def _get_or_create_session(*options):
+    """In-progress session for the current participant; ``options`` are loader options"""
     try:
         pid = _current_participant_id()
         s = (
             ScreeningSession.query.filter_by(participant_id=pid, status="in_progress")
+            .options(*options)
             .order_by(ScreeningSession.started_at.desc())
             .first()
         )
@@ -166,10 +172,9 @@ def save_step4():
     j = request.get_json(force=True)
     # Only set Frequency enum if value is provided and valid
     try:
-        tc.grapheme = Frequency(j.get("grapheme")) if j.get("grapheme") else None
-        tc.music = Frequency(j.get("music")) if j.get("music") else None
-        tc.lexical = Frequency(j.get("lexical")) if j.get("lexical") else None
-        tc.sequence = Frequency(j.get("sequence")) if j.get("sequence") else None
+        for attr in _TYPE_CHOICE_FIELDS:
+            value = j.get(attr)
+            setattr(tc, attr, Frequency(value) if value else None)
     except ValueError as e:
         return jsonify(error=f"Invalid frequency value: {str(e)}"), 400
     tc.other = (j.get("other") or "").strip() or None
@@ -181,7 +186,13 @@ def save_step4():
 
 @bp.post("/finalize")
 def finalize_screening():
-    s = _get_or_create_session()
+    # finalize() reads every step row; the one-to-ones join without multiplying rows
+    s = _get_or_create_session(
+        joinedload(ScreeningSession.health),
+        joinedload(ScreeningSession.definition),
+        joinedload(ScreeningSession.pain_emotion),
+        joinedload(ScreeningSession.type_choice),
+    )
     # Uses services through finalize() method
     s.finalize()
 
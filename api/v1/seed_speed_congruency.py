@@ -10,6 +10,7 @@ It will:
 
 from datetime import datetime
 
+from sqlalchemy import select
 from werkzeug.security import generate_password_hash
 
 from models import db, Participant, ColorStimulus, TestData
@@ -60,11 +61,19 @@ def seed(app=None):
             ("MONDAY", 255, 105, 180),
         ]
 
+        # One lookup for every spec, then one flush for whatever is missing
+        existing_stimuli = {}
+        for stim in ColorStimulus.query.filter(
+            ColorStimulus.description.in_([spec[0] for spec in stimulus_specs])
+        ).order_by(ColorStimulus.id):
+            existing_stimuli.setdefault(
+                (stim.description, stim.r, stim.g, stim.b), stim
+            )
+
         stimuli = []
+        new_stimuli = []
         for desc, r, g, b in stimulus_specs:
-            stim = ColorStimulus.query.filter_by(
-                description=desc, r=r, g=g, b=b
-            ).first()
+            stim = existing_stimuli.get((desc, r, g, b))
             if not stim:
                 stim = ColorStimulus(
                     description=desc,
@@ -76,25 +85,39 @@ def seed(app=None):
                     owner_researcher_id=None,
                     set_id=None,
                 )
-                db.session.add(stim)
-                db.session.flush()  # get stim.id without full commit
-                print(f"Created ColorStimulus: {desc} -> ({r},{g},{b}) [id={stim.id}]")
+                new_stimuli.append(stim)
             else:
                 print(f"Found existing ColorStimulus: {desc} [id={stim.id}]")
 
             stimuli.append(stim)
 
+        if new_stimuli:
+            db.session.add_all(new_stimuli)
+            db.session.flush()  # get stim.id without full commit
+            for stim in new_stimuli:
+                print(
+                    f"Created ColorStimulus: {stim.description} -> "
+                    f"({stim.r},{stim.g},{stim.b}) [id={stim.id}]"
+                )
+
         # -------------------------------------------------
         # 3) Create TestData rows that link this participant to these stimuli
         #    and mark them as valid/pass color-test associations
         # -------------------------------------------------
         user_key = str(participant.id)  # this is what our speed API will use
 
+        linked_stimulus_ids = set(
+            db.session.scalars(
+                select(TestData.stimulus_id).where(
+                    TestData.user_id == user_key,
+                    TestData.family == "color",
+                    TestData.stimulus_id.in_([stim.id for stim in stimuli]),
+                )
+            )
+        )
+
         for stim in stimuli:
-            existing_td = TestData.query.filter_by(
-                user_id=user_key, stimulus_id=stim.id, family="color"
-            ).first()
-            if existing_td:
+            if stim.id in linked_stimulus_ids:
                 print(
                     f"TestData already exists for user_id={user_key}, stimulus_id={stim.id}"
                 )
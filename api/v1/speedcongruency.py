@@ -1,8 +1,9 @@
 from flask import Blueprint, request, jsonify, session
+import math
 import random
 
 from models import db, Participant, TestData, SpeedCongruency, ColorStimulus
-from sqlalchemy import select
+from sqlalchemy import insert, select
 
 bp = Blueprint("speed_congruency", __name__)
 
@@ -252,6 +253,43 @@ def api_speed_congruency_next():
     )
 
 
+# =====================================
+# ROW BUILDER: one submitted trial -> SpeedCongruency columns
+# =====================================
+
+
+def _trial_values(participant: Participant, data: dict, expected_rgb):
+    """
+    Map one submitted trial payload to SpeedCongruency column values.
+    expected_rgb is the (r, g, b) of the linked stimulus, or None.
+    """
+    expected_r, expected_g, expected_b = expected_rgb or (None, None, None)
+    reaction_ms = data.get("reactionTimeMs")
+    selected_id = data.get("selectedOptionId")
+
+    return {
+        "participant_id": str(participant.id),
+        "stimulus_id": data.get("stimulusId"),
+        "trial_index": data.get("trialIndex"),
+        "cue_word": data.get("trigger"),
+        "cue_type": data.get("cue_type", "word"),
+        "expected_r": expected_r,
+        "expected_g": expected_g,
+        "expected_b": expected_b,
+        # we are only storing which option they chose
+        "chosen_name": selected_id,
+        "chosen_r": None,
+        "chosen_g": None,
+        "chosen_b": None,
+        # Simple correctness rule: if they picked the option whose id == "correct"
+        "matched": selected_id == "correct",
+        "response_ms": int(reaction_ms) if reaction_ms is not None else None,
+        "meta_json": {
+            "test_data_id": data.get("testDataId"),
+        },
+    }
+
+
 # =====================================
 # POST /api/speed-congruency/submit
 # =====================================
@@ -271,6 +309,7 @@ def api_speed_congruency_submit():
         "testDataId": <id from /next>,
         "stimulusId": <id from /next>
       }
+    or { "trials": [ ... ] } to record several at once (same as /submit_bulk).
     """
 
     participant, error = _require_participant()
@@ -278,49 +317,111 @@ def api_speed_congruency_submit():
         return error
 
     data = request.get_json(force=True) or {}
-
-    trial_index = data.get("trialIndex")
-    trigger = data.get("trigger")
-    test_data_id = data.get("testDataId")
-    stimulus_id = data.get("stimulusId")
-    reaction_ms = data.get("reactionTimeMs")
-    selected_id = data.get("selectedOptionId")
+    if isinstance(data.get("trials"), list):
+        return _submit_trials(participant, data["trials"])
 
     # Determine expected color from TestData / ColorStimulus (for logging)
-    expected_r = expected_g = expected_b = None
+    expected_rgb = None
+    test_data_id = data.get("testDataId")
     if test_data_id:
         td = db.session.get(TestData, test_data_id)
         if td and td.stimulus:
-            expected_r, expected_g, expected_b = (
-                td.stimulus.r,
-                td.stimulus.g,
-                td.stimulus.b,
-            )
-
-    # Simple correctness rule: if they picked the option whose id == "correct"
-    matched = selected_id == "correct"
-
-    row = SpeedCongruency(
-        participant_id=str(participant.id),
-        stimulus_id=stimulus_id,
-        trial_index=trial_index,
-        cue_word=trigger,
-        cue_type=data.get("cue_type", "word"),
-        expected_r=expected_r,
-        expected_g=expected_g,
-        expected_b=expected_b,
-        chosen_name=selected_id,  # we are only storing which option they chose
-        chosen_r=None,
-        chosen_g=None,
-        chosen_b=None,
-        matched=matched,
-        response_ms=int(reaction_ms) if reaction_ms is not None else None,
-        meta_json={
-            "test_data_id": test_data_id,
-        },
-    )
+            expected_rgb = (td.stimulus.r, td.stimulus.g, td.stimulus.b)
+
+    row = SpeedCongruency(**_trial_values(participant, data, expected_rgb))
 
     db.session.add(row)
     db.session.commit()
 
-    return jsonify({"ok": True, "matched": matched}), 200
+    return jsonify({"ok": True, "matched": row.matched}), 200
+
+
+# =====================================
+# POST /api/speed-congruency/submit_bulk
+# =====================================
+
+
+@bp.post("/submit_bulk")
+def api_speed_congruency_submit_bulk():
+    """
+    Record several speed-congruency trials in one request.
+
+    Frontend sends:
+      { "trials": [ <same shape as /submit>, ... ] }
+    """
+
+    participant, error = _require_participant()
+    if error:
+        return error
+
+    data = request.get_json(force=True) or {}
+    return _submit_trials(participant, data.get("trials"))
+
+
+def _trial_error(trial):
+    """Why one submitted trial can't be stored, or None if it is well-formed."""
+    if not isinstance(trial, dict):
+        return "must be an object"
+    test_data_id = trial.get("testDataId")
+    if test_data_id is not None and not (
+        (isinstance(test_data_id, int) and not isinstance(test_data_id, bool))
+        or (isinstance(test_data_id, str) and test_data_id.isdecimal())
+    ):
+        return "testDataId must be an id"
+    reaction_ms = trial.get("reactionTimeMs")
+    if reaction_ms is not None and (
+        isinstance(reaction_ms, bool)
+        or not isinstance(reaction_ms, (int, float))
+        or not math.isfinite(reaction_ms)
+    ):
+        return "reactionTimeMs must be a number"
+    return None
+
+
+def _test_data_id(trial):
+    """The trial's testDataId as an int (clients may send it as a string), or None."""
+    test_data_id = trial.get("testDataId")
+    return int(test_data_id) if test_data_id else None
+
+
+def _submit_trials(participant: Participant, trials):
+    """Insert every trial in `trials` with one executemany and one commit."""
+    if not isinstance(trials, list) or not trials:
+        return jsonify({"error": "trials must be a non-empty list"}), 400
+    for i, trial in enumerate(trials):
+        reason = _trial_error(trial)
+        if reason:
+            return jsonify({"error": f"trials[{i}] {reason}"}), 400
+
+    # One lookup for every referenced association instead of one per trial.
+    # TestData.id keys the result, so look trials up by the normalised int id.
+    trial_td_ids = [_test_data_id(t) for t in trials]
+    test_data_ids = {td_id for td_id in trial_td_ids if td_id}
+    expected = {}
+    if test_data_ids:
+        stmt = (
+            select(TestData.id, ColorStimulus.r, ColorStimulus.g, ColorStimulus.b)
+            .join(TestData.stimulus)
+            .where(TestData.id.in_(test_data_ids))
+        )
+        expected = {td_id: (r, g, b) for td_id, r, g, b in db.session.execute(stmt)}
+
+    rows = [
+        _trial_values(participant, t, expected.get(td_id))
+        for t, td_id in zip(trials, trial_td_ids)
+    ]
+
+    # executemany-style INSERT (batched via insertmanyvalues), single commit
+    db.session.execute(insert(SpeedCongruency), rows)
+    db.session.commit()
+
+    return (
+        jsonify(
+            {
+                "ok": True,
+                "count": len(rows),
+                "matched": [r["matched"] for r in rows],
+            }
+        ),
+        200,
+    )
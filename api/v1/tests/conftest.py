@@ -3,17 +3,41 @@ Pytest configuration and shared fixtures for SYNTEST backend tests
 Provides: app, client, database, authentication fixtures
 """
 
+import functools
+import json
 import pytest
 import os
-import tempfile
+import sqlite3
 from datetime import datetime, timezone
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+import werkzeug.security
 from werkzeug.security import generate_password_hash
 
+try:
+    import orjson
+except ImportError:  # optional dev dependency; stdlib json is just slower
+    orjson = None
+
 # Import Flask app and models
 import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+# Each pytest-xdist worker gets its own shared-cache in-memory database.
+# Must be set before importing app, since db.init_app binds the engine at import.
+_worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+TEST_DATABASE_URI = f"sqlite:///file:memdb_{_worker}?mode=memory&cache=shared&uri=true"
+os.environ["DATABASE_URL"] = TEST_DATABASE_URI
+
+# pbkdf2 defaults to 600k iterations, read at call time. Test hashes only need
+# to round-trip, and check_password_hash takes the count from the stored hash.
+werkzeug.security.DEFAULT_PBKDF2_ITERATIONS = 1000
+
+# Opt-in: restore an empty-schema snapshot between tests instead of drop_all/create_all
+CACHE_TEST_DB = os.environ.get("SYNTEST_CACHE_TEST_DB") == "1"
+_schema_snapshot = None
+
 from app import app as flask_app
 from models import (
     db,
@@ -26,27 +50,177 @@ from models import (
 )
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-slow", action="store_true", help="also run tests marked slow"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip slow tests unless --run-slow is given"""
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="needs --run-slow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+def _sqlite_pragmas(dbapi_conn, _connection_record):
+    """Test data is disposable: skip fsync/journal bookkeeping on every commit"""
+    cursor = dbapi_conn.cursor()
+    for pragma in ("synchronous=OFF", "journal_mode=MEMORY", "temp_store=MEMORY"):
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+
+@functools.cache
+def _password_hash(password):
+    """pbkdf2 is slow by design; fixtures hash each password once per session"""
+    return generate_password_hash(password)
+
+
+if orjson is not None:
+
+    class _OrjsonProvider(DefaultJSONProvider):
+        """
+        Flask JSON provider backed by orjson. Types orjson would encode its own
+        way (datetime, dataclasses) still go through Flask's default hook.
+        """
+
+        _options = (
+            orjson.OPT_SORT_KEYS
+            | orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(
+                obj, default=self.default, option=self._options
+            ).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+
+def _json_bytes(obj):
+    """Encode a request body once, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _restore_schema_snapshot():
+    """Overwrite the test database with the empty-schema snapshot"""
+    with db.engine.connect() as connection:
+        _schema_snapshot.backup(connection.connection.driver_connection)
+
+
+def _sqlite_begin(connection):
+    """pysqlite defers BEGIN until the first DML; emit it so SAVEPOINTs nest"""
+    connection.exec_driver_sql("BEGIN")
+
+
 @pytest.fixture(scope="session")
 def app():
     """Create and configure a test Flask application"""
-    # Create a temporary database
-    db_fd, db_path = tempfile.mkstemp()
-
     flask_app.config["TESTING"] = True
-    flask_app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    flask_app.config["SQLALCHEMY_DATABASE_URI"] = TEST_DATABASE_URI
     flask_app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
     flask_app.config["SECRET_KEY"] = "test-secret-key"
     flask_app.config["WTF_CSRF_ENABLED"] = False
+    if orjson is not None:
+        flask_app.json = _OrjsonProvider(flask_app)
 
     # Create tables
     with flask_app.app_context():
+        # Keep the app's session defaults (autoflush, expire_on_commit) so tests
+        # see production flush ordering; create_savepoint only matters once
+        # db_connection binds an outer transaction.
+        db.session.configure(join_transaction_mode="create_savepoint")
+        # Drop the connection opened at import so every connection gets the pragmas
+        event.listen(db.engine, "connect", _sqlite_pragmas)
+        db.engine.dispose()
         db.create_all()
 
+        if CACHE_TEST_DB:
+            global _schema_snapshot
+            _schema_snapshot = sqlite3.connect(":memory:", check_same_thread=False)
+            with db.engine.connect() as connection:
+                connection.connection.driver_connection.backup(_schema_snapshot)
+
     yield flask_app
 
-    # Cleanup
-    os.close(db_fd)
-    os.unlink(db_path)
+    if _schema_snapshot is not None:
+        _schema_snapshot.close()
+
+
+def _outer_transaction(app):
+    """
+    Open one transaction on a dedicated connection, route db.session through it,
+    and roll it back on exit. Backs db_connection and db_module_connection.
+    """
+    with app.app_context():
+        db.create_all()
+        with db.engine.connect() as connection, pytest.MonkeyPatch.context() as mp:
+            # Hand transaction control to SQLAlchemy on this connection only;
+            # the pool shares it per thread with the legacy-mode fixtures
+            dbapi_conn = connection.connection.driver_connection
+            mp.setattr(dbapi_conn, "isolation_level", None)
+            event.listen(connection, "begin", _sqlite_begin)
+            transaction = connection.begin()
+            mp.setitem(db.engines, None, connection)
+            yield connection
+            transaction.rollback()
+
+
+@pytest.fixture(scope="class")
+def db_connection(app):
+    """
+    One outer transaction per test class, rolled back when the class finishes.
+    db.session is routed through it, so session.commit() only releases a SAVEPOINT.
+    Use with db_savepoint in place of the autouse setup_database fixture.
+    """
+    yield from _outer_transaction(app)
+
+
+@pytest.fixture(scope="module")
+def db_module_connection(app):
+    """
+    db_connection for a whole module. Only for modules where every test runs
+    under db_savepoint; they override db_connection to return this.
+    """
+    yield from _outer_transaction(app)
+
+
+@pytest.fixture
+def db_savepoint(app, db_connection):
+    """Wrap a single test in a SAVEPOINT on db_connection and roll it back"""
+    savepoint = db_connection.begin_nested()
+    # Fresh app context so each test gets its own session / identity map
+    with app.app_context():
+        yield db_connection
+    savepoint.rollback()
+
+
+@pytest.fixture
+def db_session(db_savepoint):
+    """db.session inside db_savepoint: commits are rolled back after the test"""
+    return db.session
+
+
+@pytest.fixture
+def sql_counter(db_savepoint):
+    """Statements run on the test connection from here on - RETURNS a live list"""
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db_savepoint, "before_cursor_execute", record)
+    yield statements
+    event.remove(db_savepoint, "before_cursor_execute", record)
 
 
 @pytest.fixture(scope="function")
@@ -55,6 +229,18 @@ def client(app):
     return app.test_client()
 
 
+@pytest.fixture
+def post_json(client):
+    """POST a JSON body without Flask's per-call json= encoding - RETURNS post_json(path, body)"""
+
+    def _post_json(path, body):
+        if not isinstance(body, bytes):
+            body = _json_bytes(body)
+        return client.post(path, data=body, content_type="application/json")
+
+    return _post_json
+
+
 @pytest.fixture(scope="function")
 def runner(app):
     """Create a test CLI runner"""
@@ -72,13 +258,20 @@ def init_database(app):
 
 
 @pytest.fixture(autouse=True)
-def setup_database(app):
-    """Automatically setup and teardown database for each test"""
+def setup_database(request, app):
+    """Automatically setup and teardown database for each test (skipped for no_db)"""
+    if request.node.get_closest_marker("no_db"):
+        yield
+        return
     with app.app_context():
-        db.create_all()
+        if _schema_snapshot is None:
+            db.create_all()
         yield
         db.session.remove()
-        db.drop_all()
+        if _schema_snapshot is None:
+            db.drop_all()
+        else:
+            _restore_schema_snapshot()
 
 
 @pytest.fixture
@@ -89,7 +282,7 @@ def sample_participant(app):
             participant_id="P_TEST_001",
             name="Test Participant",
             email="test@example.com",
-            password_hash=generate_password_hash("password123"),
+            password_hash=_password_hash("password123"),
             age=25,
             country="USA",
             screening_completed=False,
@@ -98,9 +291,6 @@ def sample_participant(app):
         db.session.add(participant)
         db.session.commit()
 
-        # Refresh to get the ID
-        db.session.refresh(participant)
-
         yield participant
 
         # Cleanup handled by setup_database fixture
@@ -113,14 +303,12 @@ def sample_researcher(app):
         researcher = Researcher(
             name="Dr. Test",
             email="researcher@example.com",
-            password_hash=generate_password_hash("research123"),
+            password_hash=_password_hash("research123"),
             institution="Test University",
         )
         db.session.add(researcher)
         db.session.commit()
 
-        db.session.refresh(researcher)
-
         yield researcher
 
 
@@ -137,8 +325,6 @@ def sample_test(app):
         db.session.add(test)
         db.session.commit()
 
-        db.session.refresh(test)
-
         yield test
 
 
@@ -159,8 +345,6 @@ def sample_color_stimulus(app, sample_researcher):
         db.session.add(stimulus)
         db.session.commit()
 
-        db.session.refresh(stimulus)
-
         yield stimulus
 
 
@@ -193,10 +377,6 @@ def multiple_stimuli(app, sample_researcher):
 
         db.session.commit()
 
-        # Refresh all
-        for s in stimuli:
-            db.session.refresh(s)
-
         yield stimuli
 
 
@@ -217,29 +397,44 @@ def sample_color_trial(app, sample_participant, sample_color_stimulus):
         db.session.add(trial)
         db.session.commit()
 
-        db.session.refresh(trial)
-
         yield trial
 
 
+# Signed session cookie per (user_id, role), reused for the whole session
+_SESSION_COOKIES = {}
+
+
+@pytest.fixture
+def login(client, app):
+    """Set a signed session cookie directly on the client - RETURNS login(user_id, role)"""
+
+    def _login(user_id, role="participant"):
+        key = (user_id, role)
+        if key not in _SESSION_COOKIES:
+            serializer = app.session_interface.get_signing_serializer(app)
+            _SESSION_COOKIES[key] = serializer.dumps(
+                {"user_id": user_id, "user_role": role}
+            )
+        client.set_cookie(app.config["SESSION_COOKIE_NAME"], _SESSION_COOKIES[key])
+
+    yield _login
+
+    # The client may be class-scoped; don't leak this login into the next test
+    client.delete_cookie(app.config["SESSION_COOKIE_NAME"])
+
+
 # FIXED: Auth fixtures now properly set up client sessions
 @pytest.fixture
-def auth_participant(client, sample_participant):
+def auth_participant(login, sample_participant):
     """Authenticate a participant (set session) - RETURNS PARTICIPANT"""
-    with client.session_transaction() as sess:
-        sess["user_id"] = sample_participant.id
-        sess["user_role"] = "participant"
-
+    login(sample_participant.id, "participant")
     return sample_participant  # Return participant so tests can use it
 
 
 @pytest.fixture
-def auth_researcher(client, sample_researcher):
+def auth_researcher(login, sample_researcher):
     """Authenticate a researcher (set session) - RETURNS RESEARCHER"""
-    with client.session_transaction() as sess:
-        sess["user_id"] = sample_researcher.id
-        sess["user_role"] = "researcher"
-
+    login(sample_researcher.id, "researcher")
     return sample_researcher  # Return researcher so tests can use it
 
 
@@ -286,8 +481,6 @@ def completed_screening(app, sample_participant):
         db.session.add(session_obj)
         db.session.commit()
 
-        db.session.refresh(session_obj)
-
         yield session_obj
 
 
@@ -311,9 +504,6 @@ def sample_trials_batch(app, sample_participant):
 
         db.session.commit()
 
-        for t in trials:
-            db.session.refresh(t)
-
         yield trials
 
 
@@ -325,7 +515,7 @@ def create_participant(name="Test User", email="test@test.com"):
     participant = Participant(
         name=name,
         email=email,
-        password_hash=generate_password_hash("password"),
+        password_hash=_password_hash("password"),
         age=25,
         country="USA",
     )
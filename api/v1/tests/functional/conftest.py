@@ -0,0 +1,138 @@
+"""
+Shared fixtures for v1 functional tests
+Provides: seeded speed-congruency associations,
+class-scoped participant/stimulus/TestData for db_savepoint test classes
+"""
+
+import pytest
+from models import ColorStimulus, Participant, TestData, db
+from sqlalchemy import insert
+
+from ..conftest import _password_hash
+
+
+@pytest.fixture(scope="class")
+def seeded_trial(app, db_connection):
+    """
+    Participant with two valid color associations (ONE, TWO) - RETURNS PARTICIPANT
+    Class-scoped like session_rows, so parametrized /next cases share one seeding.
+    """
+    with app.app_context():
+        # The participant outlives this context; keep its attributes on commit
+        db.session().expire_on_commit = False
+        participant = db.session.scalars(
+            insert(Participant).returning(Participant),
+            [
+                {
+                    "participant_id": "P_SEEDED_001",
+                    "name": "Seeded Participant",
+                    "email": "seeded@example.com",
+                    "password_hash": _password_hash("password123"),
+                }
+            ],
+        ).one()
+        # Parameter order keeps ONE before TWO, the order /next serves them in
+        stimulus_ids = db.session.scalars(
+            insert(ColorStimulus).returning(
+                ColorStimulus.id, sort_by_parameter_order=True
+            ),
+            [
+                {
+                    "description": desc,
+                    "r": 100 + i * 50,
+                    "g": 150 + i * 50,
+                    "b": 200,
+                    "trigger_type": "word",
+                }
+                for i, desc in enumerate(["ONE", "TWO"])
+            ],
+        ).all()
+        db.session.execute(
+            insert(TestData),
+            [
+                {
+                    "user_id": str(participant.id),
+                    "family": "color",
+                    "cct_valid": 1,
+                    "cct_pass": True,
+                    "stimulus_id": stimulus_id,
+                    "stimulus_type": "word",
+                }
+                for stimulus_id in stimulus_ids
+            ],
+        )
+        db.session.commit()
+        return participant
+
+
+# Class-scoped rows live in the db_connection outer transaction and are rolled
+# back with it; only use them from classes whose tests run under db_savepoint.
+
+
+@pytest.fixture(scope="class")
+def session_rows(app, db_connection):
+    """
+    Participant, ORANGE word stimulus and a valid TestData linking them.
+    Each row is one INSERT ... RETURNING; one commit for all three.
+    """
+    with app.app_context():
+        # The rows outlive this context; keep their loaded attributes on commit
+        db.session().expire_on_commit = False
+        participant = db.session.scalars(
+            insert(Participant).returning(Participant),
+            [
+                {
+                    "participant_id": "P_SESSION_001",
+                    "name": "Session Participant",
+                    "email": "session@example.com",
+                    "password_hash": _password_hash("password123"),
+                    "age": 30,
+                    "country": "USA",
+                }
+            ],
+        ).one()
+        stimulus = db.session.scalars(
+            insert(ColorStimulus).returning(ColorStimulus),
+            [
+                {
+                    "description": "ORANGE",
+                    "r": 255,
+                    "g": 179,
+                    "b": 71,
+                    "family": "color",
+                    "trigger_type": "word",
+                }
+            ],
+        ).one()
+        td = db.session.scalars(
+            insert(TestData).returning(TestData),
+            [
+                {
+                    "user_id": str(participant.id),
+                    "family": "color",
+                    "cct_valid": 1,
+                    "cct_pass": True,
+                    "stimulus_id": stimulus.id,
+                }
+            ],
+        ).one()
+        db.session.commit()
+        return participant, stimulus, td
+
+
+@pytest.fixture(scope="class")
+def session_participant(session_rows):
+    """Participant created once per class - RETURNS PARTICIPANT"""
+    return session_rows[0]
+
+
+@pytest.fixture(scope="class")
+def session_stimulus(session_rows):
+    """ORANGE word stimulus created once per class - RETURNS COLORSTIMULUS"""
+    return session_rows[1]
+
+
+@pytest.fixture(scope="class")
+def session_testdata(session_rows):
+    """Valid color association linking session_participant to session_stimulus"""
+    return session_rows[2]
@@ -652,6 +652,76 @@ class TestFinalizeScreening:
             assert "exit_code" in data
 
 
+class TestFinalizeQueries:
+    """SQL issued by /screening/finalize, counted on the savepoint connection"""
+
+    @pytest.fixture(autouse=True)
+    def setup_database(self, db_savepoint):
+        """Override the autouse create_all/drop_all: roll back a SAVEPOINT instead"""
+        yield
+
+    @pytest.fixture
+    def eligible_session_login(self, client, db_session):
+        """Logged-in participant with an eligible session, out of the identity map"""
+        p = Participant(
+            name="Test",
+            email="finalize_joined@example.com",
+            password_hash="dev",
+        )
+        db_session.add(p)
+        db_session.flush()
+        s = ScreeningSession(participant_id=p.id, consent_given=True)
+        db_session.add(s)
+        db_session.flush()
+        db_session.add_all(
+            [
+                ScreeningDefinition(session_id=s.id, answer=YesNoMaybe.yes),
+                ScreeningTypeChoice(session_id=s.id, grapheme=Frequency.yes),
+            ]
+        )
+        db_session.commit()
+        participant_id = p.id
+        # Drop the identity map so the endpoint loads the session from the DB
+        db_session.expunge_all()
+
+        with client.session_transaction() as sess:
+            sess["user_id"] = participant_id
+            sess["user_role"] = "participant"
+
+    @pytest.mark.usefixtures("eligible_session_login")
+    def test_finalize_loads_steps_with_session(self, client, sql_counter):
+        """Step rows arrive joined to the session SELECT, not as lazy fetches"""
+        sql_counter.clear()
+
+        response = client.post("/api/v1/screening/finalize", json={})
+
+        assert response.status_code == 200
+        assert response.get_json()["eligible"] is True
+        step_tables = (
+            "screening_health",
+            "screening_definition",
+            "screening_pain_emotion",
+            "screening_type_choice",
+        )
+        selects = [q for q in sql_counter if q.lstrip().startswith("SELECT")]
+        for table in step_tables:
+            assert not any(
+                q.split("FROM", 1)[1].lstrip().startswith(table) for q in selects
+            )
+
+    @pytest.mark.usefixtures("eligible_session_login")
+    def test_finalize_updates_session_once(self, client, sql_counter):
+        """Outcome, recommendations and status reach the session row in one UPDATE"""
+        sql_counter.clear()
+
+        response = client.post("/api/v1/screening/finalize", json={})
+
+        assert response.status_code == 200
+        assert response.get_json()["recommended_tests"][0]["name"] == "Grapheme-Color"
+        updates = [q for q in sql_counter if q.startswith("UPDATE screening_sessions")]
+        assert len(updates) == 1
+
+
 class TestHelperFunctions:
     """Tests for helper functions"""
 
@@ -11,44 +11,101 @@ Comprehensive route and functional testing for speedcongruency.py
 Target: 95%+ coverage for speedcongruency.py
 """
 
+from types import MappingProxyType
+
+import pytest
+
+from flask import Flask, session
+from sqlalchemy import func, select
+
 from models import db, TestData, SpeedCongruency, ColorStimulus
+from v1.speedcongruency import bp, api_speed_congruency_submit
+
+
+@pytest.fixture(scope="module", autouse=True)
+def lean_session(app):
+    """Skip autoflush and post-commit expiry for this module's tiny working sets"""
+    factory_kw = db.session.session_factory.kw
+    saved = {key: factory_kw[key] for key in ("autoflush", "expire_on_commit")}
+    with app.app_context():
+        db.session.configure(autoflush=False, expire_on_commit=False)
+    yield
+    with app.app_context():
+        db.session.configure(**saved)
+
+
+@pytest.fixture(autouse=True)
+def setup_database(db_savepoint):
+    """Roll back each test's rows instead of dropping and recreating tables"""
+    yield
+
+
+@pytest.fixture(scope="class")
+def client(app):
+    """One test client per class; the login fixture clears its session cookie"""
+    return app.test_client()
+
+
+OPTION_FIELDS = frozenset({"id", "label", "color", "hex", "r", "g", "b"})
+
+
+def _stim(desc, rgb, trigger_type, owner_id):
+    """ColorStimulus factory for the (description, rgb, trigger) rows used below"""
+    r, g, b = rgb
+    return ColorStimulus(
+        description=desc,
+        r=r,
+        g=g,
+        b=b,
+        trigger_type=trigger_type,
+        owner_researcher_id=owner_id,
+    )
+
+
+# Shared /submit body (read-only); tests spread it and override only what they vary
+SUBMIT_TEMPLATE = MappingProxyType(
+    {
+        "trialIndex": 0,
+        "trigger": "TEST",
+        "selectedOptionId": "correct",
+        "testDataId": 1,
+        "stimulusId": 1,
+    }
+)
+
+
+def submit_direct(app, user_id, payload):
+    """Call the submit view in a request context, skipping routing and WSGI"""
+    with app.test_request_context(
+        "/api/v1/speedcongruency/submit", method="POST", json=payload
+    ):
+        session["user_id"] = user_id
+        session["user_role"] = "participant"
+        return api_speed_congruency_submit()
 
 
 class TestSpeedCongruencyHelpers:
     """Test helper functions via endpoints"""
 
-    def test_require_participant_success(self, client, app, sample_participant):
+    def test_require_participant_success(self, client, login, sample_participant):
         """Valid session → auth passes; no color data returns 404"""
-        with client.session_transaction() as sess:
-            sess["user_id"] = sample_participant.id
-            sess["user_role"] = "participant"
+        login(sample_participant.id)
 
         response = client.get("/api/v1/speedcongruency/next")
         assert response.status_code == 404
         data = response.get_json()
         assert data["error"] == "no_color_data"
 
-    def test_require_participant_no_session(self, client):
-        """No session → 401"""
-        response = client.get("/api/v1/speedcongruency/next")
-        assert response.status_code == 401
-        data = response.get_json()
-        assert "Not authenticated" in data["error"]
-
-    def test_require_participant_wrong_role(self, client, app, sample_researcher):
+    def test_require_participant_wrong_role(self, client, login, sample_researcher):
         """Wrong role → 401"""
-        with client.session_transaction() as sess:
-            sess["user_id"] = sample_researcher.id
-            sess["user_role"] = "researcher"
+        login(sample_researcher.id, role="researcher")
 
         response = client.get("/api/v1/speedcongruency/next")
         assert response.status_code == 401
 
-    def test_require_participant_not_found(self, client):
+    def test_require_participant_not_found(self, client, login):
         """Non-existent participant id → 404"""
-        with client.session_transaction() as sess:
-            sess["user_id"] = 99999
-            sess["user_role"] = "participant"
+        login(99999)
 
         response = client.get("/api/v1/speedcongruency/next")
         assert response.status_code == 404
@@ -56,84 +113,67 @@ class TestSpeedCongruencyHelpers:
         assert "Participant not found" in data["error"]
 
     def test_get_speed_congruency_pool_with_numeric_id(
-        self, client, app, sample_participant
+        self, client, login, sample_participant
     ):
         """Pool using str(participant.id) path"""
-        with app.app_context():
-            td = TestData(
-                user_id=str(sample_participant.id),
-                family="color",
-                cct_valid=1,
-                cct_pass=True,
-            )
-            db.session.add(td)
-            db.session.commit()
+        td = TestData(
+            user_id=str(sample_participant.id),
+            family="color",
+            cct_valid=1,
+            cct_pass=True,
+        )
+        db.session.add(td)
+        db.session.commit()
 
-        with client.session_transaction() as sess:
-            sess["user_id"] = sample_participant.id
-            sess["user_role"] = "participant"
+        login(sample_participant.id)
 
         response = client.get("/api/v1/speedcongruency/next?index=0")
         assert response.status_code == 500  # missing stimulus
 
     def test_get_speed_congruency_pool_with_participant_id(
-        self, client, app, sample_participant
+        self, client, login, sample_participant
     ):
         """Pool fallback using participant.participant_id"""
-        with app.app_context():
-            td = TestData(
-                user_id=sample_participant.participant_id,
-                family="color",
-                cct_valid=1,
-                cct_pass=True,
-            )
-            db.session.add(td)
-            db.session.commit()
+        td = TestData(
+            user_id=sample_participant.participant_id,
+            family="color",
+            cct_valid=1,
+            cct_pass=True,
+        )
+        db.session.add(td)
+        db.session.commit()
 
-        with client.session_transaction() as sess:
-            sess["user_id"] = sample_participant.id
-            sess["user_role"] = "participant"
+        login(sample_participant.id)
 
         response = client.get("/api/v1/speedcongruency/next?index=0")
         assert response.status_code == 500  # missing stimulus
 
     def test_get_speed_congruency_pool_filters_color_family(
-        self, client, app, sample_participant, sample_researcher
+        self, client, login, sample_participant, sample_researcher
     ):
         """Pool only includes color family tests"""
-        with app.app_context():
-            td1 = TestData(
-                user_id=str(sample_participant.id),
-                family="other",
-                cct_valid=1,
-                cct_pass=True,
-            )
-            db.session.add(td1)
-
-            stimulus = ColorStimulus(
-                description="A",
-                r=100,
-                g=150,
-                b=200,
-                trigger_type="letter",
-                owner_researcher_id=sample_researcher.id,
-            )
-            db.session.add(stimulus)
-            db.session.commit()
-
-            td2 = TestData(
-                user_id=str(sample_participant.id),
-                family="color",
-                cct_valid=1,
-                cct_pass=True,
-                stimulus_id=stimulus.id,
-            )
-            db.session.add(td2)
-            db.session.commit()
+        td1 = TestData(
+            user_id=str(sample_participant.id),
+            family="other",
+            cct_valid=1,
+            cct_pass=True,
+        )
 
-        with client.session_transaction() as sess:
-            sess["user_id"] = sample_participant.id
-            sess["user_role"] = "participant"
+        stimulus = _stim("A", (100, 150, 200), "letter", sample_researcher.id)
+        db.session.add_all([td1, stimulus])
+        db.session.flush()
+
+        td2 = TestData(
+            user_id=str(sample_participant.id),
+            family="color",
+            cct_valid=1,
+            cct_pass=True,
+            stimulus_id=stimulus.id,
+        )
+        db.session.add(td2)
+        db.session.commit()
+
+        login(sample_participant.id)
 
         response = client.get("/api/v1/speedcongruency/next?index=0")
         assert response.status_code == 200
@@ -141,100 +181,69 @@ class TestSpeedCongruencyHelpers:
         assert data["totalTrials"] == 1
 
     def test_build_color_options_structure(
-        self, client, app, sample_participant, sample_researcher
+        self, client, login, sample_participant, sample_researcher
     ):
         """Options structure includes required fields"""
-        with app.app_context():
-            stimulus = ColorStimulus(
-                description="TEST",
-                r=126,
-                g=217,
-                b=87,
-                trigger_type="word",
-                owner_researcher_id=sample_researcher.id,
-            )
-            db.session.add(stimulus)
-            db.session.commit()
-
-            td = TestData(
-                user_id=str(sample_participant.id),
-                family="color",
-                cct_valid=1,
-                cct_pass=True,
-                stimulus_id=stimulus.id,
-            )
-            db.session.add(td)
-            db.session.commit()
+        stimulus = _stim("TEST", (126, 217, 87), "word", sample_researcher.id)
+        db.session.add(stimulus)
+        db.session.flush()
+
+        td = TestData(
+            user_id=str(sample_participant.id),
+            family="color",
+            cct_valid=1,
+            cct_pass=True,
+            stimulus_id=stimulus.id,
+        )
+        db.session.add(td)
+        db.session.commit()
 
-        with client.session_transaction() as sess:
-            sess["user_id"] = sample_participant.id
-            sess["user_role"] = "participant"
+        login(sample_participant.id)
 
         response = client.get("/api/v1/speedcongruency/next?index=0")
         assert response.status_code == 200
         data = response.get_json()
 
-        assert len(data["options"]) == 4
-        for opt in data["options"]:
-            assert "id" in opt
-            assert "label" in opt
-            assert "color" in opt
-            assert "hex" in opt
-            assert "r" in opt
-            assert "g" in opt
-            assert "b" in opt
+        options = data["options"]
+        assert len(options) == 4
+        assert all(OPTION_FIELDS <= opt.keys() for opt in options)
 
-        correct_options = [opt for opt in data["options"] if opt["id"] == "correct"]
-        assert len(correct_options) == 1
+        ids = [opt["id"] for opt in options]
+        assert ids.count("correct") == 1
 
     def test_build_color_options_excludes_expected_color(
-        self, client, app, sample_participant, sample_researcher
+        self, client, login, sample_participant, sample_researcher
     ):
         """Distractors exclude expected color"""
-        with app.app_context():
-            stimulus = ColorStimulus(
-                description="X",
-                r=239,
-                g=68,
-                b=68,  # #EF4444
-                trigger_type="letter",
-                owner_researcher_id=sample_researcher.id,
-            )
-            db.session.add(stimulus)
-            db.session.commit()
-
-            td = TestData(
-                user_id=str(sample_participant.id),
-                family="color",
-                cct_valid=1,
-                cct_pass=True,
-                stimulus_id=stimulus.id,
-            )
-            db.session.add(td)
-            db.session.commit()
+        stimulus = _stim("X", (239, 68, 68), "letter", sample_researcher.id)  # #EF4444
+        db.session.add(stimulus)
+        db.session.flush()
+
+        td = TestData(
+            user_id=str(sample_participant.id),
+            family="color",
+            cct_valid=1,
+            cct_pass=True,
+            stimulus_id=stimulus.id,
+        )
+        db.session.add(td)
+        db.session.commit()
 
-        with client.session_transaction() as sess:
-            sess["user_id"] = sample_participant.id
-            sess["user_role"] = "participant"
+        login(sample_participant.id)
 
         response = client.get("/api/v1/speedcongruency/next?index=0")
         assert response.status_code == 200
         data = response.get_json()
 
-        expected_hex = "#ef4444"
-        color_counts = sum(
-            1 for opt in data["options"] if opt["hex"].lower() == expected_hex
-        )
-        assert color_counts == 1
+        hexes = [opt["hex"].lower() for opt in data["options"]]
+        assert hexes.count("#ef4444") == 1
 
 
 class TestSpeedCongruencyNextEndpoint:
     """Test GET /api/v1/speedcongruency/next"""
 
-    def test_next_no_color_data(self, client, app, sample_participant):
-        with client.session_transaction() as sess:
-            sess["user_id"] = sample_participant.id
-            sess["user_role"] = "participant"
+    def test_next_no_color_data(self, client, login, sample_participant):
+        login(sample_participant.id)
 
         response = client.get("/api/v1/speedcongruency/next?index=0")
         assert response.status_code == 404
@@ -242,233 +251,53 @@ class TestSpeedCongruencyNextEndpoint:
         assert data["error"] == "no_color_data"
         assert data["totalTrials"] == 0
 
-    def test_next_first_trial(self, client, app, sample_participant, sample_researcher):
-        with app.app_context():
-            stimulus = ColorStimulus(
-                description="BLUE",
-                r=77,
-                g=159,
-                b=255,
-                trigger_type="word",
-                owner_researcher_id=sample_researcher.id,
-            )
-            db.session.add(stimulus)
-            db.session.commit()
-
-            td = TestData(
-                user_id=str(sample_participant.id),
-                family="color",
-                cct_valid=1,
-                cct_pass=True,
-                stimulus_id=stimulus.id,
-                stimulus_type="word",
-            )
-            db.session.add(td)
-            db.session.commit()
-
-        with client.session_transaction() as sess:
-            sess["user_id"] = sample_participant.id
-            sess["user_role"] = "participant"
-
-        response = client.get("/api/v1/speedcongruency/next?index=0")
-        assert response.status_code == 200
-        data = response.get_json()
-        assert data["trigger"] == "BLUE"
-        assert data["index"] == 0
-        assert data["totalTrials"] == 1
-        assert "options" in data
-        assert "expectedColor" in data
-        assert data["expectedColor"]["r"] == 77
-
-    def test_next_trial_index_parameter(
-        self, client, app, sample_participant, sample_researcher
-    ):
-        with app.app_context():
-            for i, desc in enumerate(["ONE", "TWO"]):
-                stimulus = ColorStimulus(
-                    description=desc,
-                    r=100 + i * 50,
-                    g=150 + i * 50,
-                    b=200,
-                    trigger_type="number",
-                    owner_researcher_id=sample_researcher.id,
-                )
-                db.session.add(stimulus)
-                db.session.commit()
-
-                td = TestData(
-                    user_id=str(sample_participant.id),
-                    family="color",
-                    cct_valid=1,
-                    cct_pass=True,
-                    stimulus_id=stimulus.id,
-                )
-                db.session.add(td)
-            db.session.commit()
-
-        with client.session_transaction() as sess:
-            sess["user_id"] = sample_participant.id
-            sess["user_role"] = "participant"
-
-        response = client.get("/api/v1/speedcongruency/next?trialIndex=1")
-        assert response.status_code == 200
-        data = response.get_json()
-        assert data["index"] == 1
-        assert data["trigger"] == "TWO"
-
-    def test_next_invalid_index(
-        self, client, app, sample_participant, sample_researcher
-    ):
-        with app.app_context():
-            stimulus = ColorStimulus(
-                description="A",
-                r=100,
-                g=150,
-                b=200,
-                trigger_type="letter",
-                owner_researcher_id=sample_researcher.id,
-            )
-            db.session.add(stimulus)
-            db.session.commit()
-
-            td = TestData(
-                user_id=str(sample_participant.id),
-                family="color",
-                cct_valid=1,
-                cct_pass=True,
-                stimulus_id=stimulus.id,
-            )
-            db.session.add(td)
-            db.session.commit()
-
-        with client.session_transaction() as sess:
-            sess["user_id"] = sample_participant.id
-            sess["user_role"] = "participant"
-
-        response = client.get("/api/v1/speedcongruency/next?index=invalid")
-        assert response.status_code == 200
-        data = response.get_json()
-        assert data["index"] == 0
-
-    def test_next_index_out_of_bounds(
-        self, client, app, sample_participant, sample_researcher
-    ):
-        with app.app_context():
-            stimulus = ColorStimulus(
-                description="B",
-                r=100,
-                g=150,
-                b=200,
-                trigger_type="letter",
-                owner_researcher_id=sample_researcher.id,
-            )
-            db.session.add(stimulus)
-            db.session.commit()
-
-            td = TestData(
-                user_id=str(sample_participant.id),
-                family="color",
-                cct_valid=1,
-                cct_pass=True,
-                stimulus_id=stimulus.id,
-            )
-            db.session.add(td)
-            db.session.commit()
-
-        with client.session_transaction() as sess:
-            sess["user_id"] = sample_participant.id
-            sess["user_role"] = "participant"
-
-        response = client.get("/api/v1/speedcongruency/next?index=5")
-        assert response.status_code == 200
-        data = response.get_json()
-        assert data["done"] is True
-        assert data["totalTrials"] == 1
-
-    def test_next_negative_index(
-        self, client, app, sample_participant, sample_researcher
-    ):
-        with app.app_context():
-            stimulus = ColorStimulus(
-                description="C",
-                r=100,
-                g=150,
-                b=200,
-                trigger_type="letter",
-                owner_researcher_id=sample_researcher.id,
-            )
-            db.session.add(stimulus)
-            db.session.commit()
-
-            td = TestData(
-                user_id=str(sample_participant.id),
-                family="color",
-                cct_valid=1,
-                cct_pass=True,
-                stimulus_id=stimulus.id,
-            )
-            db.session.add(td)
-            db.session.commit()
-
-        with client.session_transaction() as sess:
-            sess["user_id"] = sample_participant.id
-            sess["user_role"] = "participant"
-
-        response = client.get("/api/v1/speedcongruency/next?index=-1")
+    @pytest.mark.parametrize(
+        "query,expected",
+        [
+            (
+                "index=0",
+                {
+                    "trigger": "ONE",
+                    "index": 0,
+                    "totalTrials": 2,
+                    "cue_type": "word",
+                    "expectedColor": {"r": 100, "g": 150, "b": 200, "hex": "#6496c8"},
+                },
+            ),
+            ("trialIndex=1", {"trigger": "TWO", "index": 1, "totalTrials": 2}),
+            ("index=invalid", {"trigger": "ONE", "index": 0}),
+            ("index=5", {"done": True, "totalTrials": 2}),
+            ("index=-1", {"done": True, "totalTrials": 2}),
+        ],
+    )
+    def test_next_variants(self, client, login, seeded_trial, query, expected):
+        login(seeded_trial.id)
+
+        response = client.get(f"/api/v1/speedcongruency/next?{query}")
         assert response.status_code == 200
         data = response.get_json()
-        assert data["done"] is True
-
-    def test_next_missing_stimulus(self, client, app, sample_participant):
-        with app.app_context():
-            td = TestData(
-                user_id=str(sample_participant.id),
-                family="color",
-                cct_valid=1,
-                cct_pass=True,
-                stimulus_id=None,
-            )
-            db.session.add(td)
-            db.session.commit()
+        assert expected.items() <= data.items()
+
+    def test_next_missing_stimulus(self, client, login, sample_participant):
+        td = TestData(
+            user_id=str(sample_participant.id),
+            family="color",
+            cct_valid=1,
+            cct_pass=True,
+            stimulus_id=None,
+        )
+        db.session.add(td)
+        db.session.commit()
 
-        with client.session_transaction() as sess:
-            sess["user_id"] = sample_participant.id
-            sess["user_role"] = "participant"
+        login(sample_participant.id)
 
         response = client.get("/api/v1/speedcongruency/next?index=0")
         assert response.status_code == 500
         data = response.get_json()
         assert data["error"] == "missing_stimulus"
 
-    def test_next_response_structure(
-        self, client, app, sample_participant, sample_researcher
-    ):
-        with app.app_context():
-            stimulus = ColorStimulus(
-                description="GREEN",
-                r=102,
-                g=187,
-                b=106,
-                trigger_type="word",
-                owner_researcher_id=sample_researcher.id,
-            )
-            db.session.add(stimulus)
-            db.session.commit()
-
-            td = TestData(
-                user_id=str(sample_participant.id),
-                family="color",
-                cct_valid=1,
-                cct_pass=True,
-                stimulus_id=stimulus.id,
-                stimulus_type="word",
-            )
-            db.session.add(td)
-            db.session.commit()
-
-        with client.session_transaction() as sess:
-            sess["user_id"] = sample_participant.id
-            sess["user_role"] = "participant"
+    def test_next_response_structure(self, client, login, seeded_trial):
+        login(seeded_trial.id)
 
         response = client.get("/api/v1/speedcongruency/next?index=0")
         assert response.status_code == 200
@@ -489,46 +318,31 @@ class TestSpeedCongruencyNextEndpoint:
 class TestSpeedCongruencySubmitEndpoint:
     """Test POST /api/v1/speedcongruency/submit"""
 
-    def test_submit_correct_answer(
-        self, client, app, sample_participant, sample_researcher
+    @pytest.mark.parametrize(
+        "selected,expected_matched,rt",
+        [("correct", True, 842.3), ("opt1", False, 1250.7)],
+    )
+    def test_submit_answer(
+        self,
+        client,
+        login,
+        session_participant,
+        session_testdata,
+        selected,
+        expected_matched,
+        rt,
     ):
-        with app.app_context():
-            stimulus = ColorStimulus(
-                description="RED",
-                r=239,
-                g=68,
-                b=68,
-                trigger_type="word",
-                owner_researcher_id=sample_researcher.id,
-            )
-            db.session.add(stimulus)
-            db.session.commit()
-
-            td = TestData(
-                user_id=str(sample_participant.id),
-                family="color",
-                cct_valid=1,
-                cct_pass=True,
-                stimulus_id=stimulus.id,
-            )
-            db.session.add(td)
-            db.session.commit()
-            test_data_id = td.id
-            stimulus_id = stimulus.id
-
-        with client.session_transaction() as sess:
-            sess["user_id"] = sample_participant.id
-            sess["user_role"] = "participant"
+        login(session_participant.id)
 
         response = client.post(
             "/api/v1/speedcongruency/submit",
             json={
-                "trialIndex": 0,
-                "trigger": "RED",
-                "selectedOptionId": "correct",
-                "reactionTimeMs": 842.3,
-                "testDataId": test_data_id,
-                "stimulusId": stimulus_id,
+                **SUBMIT_TEMPLATE,
+                "trigger": "ORANGE",
+                "selectedOptionId": selected,
+                "reactionTimeMs": rt,
+                "testDataId": session_testdata.id,
+                "stimulusId": session_testdata.stimulus_id,
                 "cue_type": "word",
             },
         )
@@ -536,246 +350,214 @@ class TestSpeedCongruencySubmitEndpoint:
         assert response.status_code == 200
         data = response.get_json()
         assert data["ok"] is True
-        assert data["matched"] is True
+        assert data["matched"] is expected_matched
 
-        with app.app_context():
-            record = SpeedCongruency.query.filter_by(trial_index=0).first()
-            assert record is not None
-            assert record.matched is True
-            assert record.response_ms == 842
-
-    def test_submit_incorrect_answer(
-        self, client, app, sample_participant, sample_researcher
-    ):
-        with app.app_context():
-            stimulus = ColorStimulus(
-                description="BLUE",
-                r=77,
-                g=159,
-                b=255,
-                trigger_type="word",
-                owner_researcher_id=sample_researcher.id,
+        record = db.session.scalars(
+            select(SpeedCongruency).where(
+                SpeedCongruency.participant_id == str(session_participant.id),
+                SpeedCongruency.trial_index == SUBMIT_TEMPLATE["trialIndex"],
             )
-            db.session.add(stimulus)
-            db.session.commit()
-
-            td = TestData(
-                user_id=str(sample_participant.id),
-                family="color",
-                cct_valid=1,
-                cct_pass=True,
-                stimulus_id=stimulus.id,
+        ).one()
+        assert record.matched is expected_matched
+        assert record.response_ms == int(rt)
+
+    @pytest.mark.parametrize(
+        "overrides,with_testdata,expected",
+        [
+            ({}, False, {"response_ms": None}),
+            (
+                {"reactionTimeMs": 850},
+                False,
+                {"cue_type": "word", "response_ms": 850},
+            ),
+            (
+                {"trigger": "ORANGE", "reactionTimeMs": 750},
+                True,
+                {"expected_r": 255, "expected_g": 179, "expected_b": 71},
+            ),
+        ],
+        ids=["no_reaction_time", "cue_type_default", "expected_color_from_stimulus"],
+    )
+    def test_submit_persists(
+        self,
+        app,
+        session_participant,
+        session_testdata,
+        overrides,
+        with_testdata,
+        expected,
+    ):
+        """Single submit stores the row; meta_json always records testDataId"""
+        test_data_id = session_testdata.id if with_testdata else None
+        response, status = submit_direct(
+            app,
+            session_participant.id,
+            {**SUBMIT_TEMPLATE, **overrides, "testDataId": test_data_id},
+        )
+        assert status == 200
+        assert response.get_json()["ok"] is True
+
+        # Fetch only the columns under test, not a full ORM instance
+        columns = [getattr(SpeedCongruency, attr) for attr in expected]
+        row = db.session.execute(
+            select(*columns, SpeedCongruency.meta_json).where(
+                SpeedCongruency.participant_id == str(session_participant.id),
+                SpeedCongruency.trial_index == SUBMIT_TEMPLATE["trialIndex"],
             )
-            db.session.add(td)
-            db.session.commit()
-            test_data_id = td.id
-            stimulus_id = stimulus.id
-
-        with client.session_transaction() as sess:
-            sess["user_id"] = sample_participant.id
-            sess["user_role"] = "participant"
+        ).one()
+        assert row._asdict() == {
+            **expected,
+            "meta_json": {"test_data_id": test_data_id},
+        }
+
+    def test_submit_multiple_trials(self, client, login, session_participant):
+        login(session_participant.id)
+        trials = [
+            {
+                **SUBMIT_TEMPLATE,
+                "trialIndex": i,
+                "trigger": f"TRIGGER_{i}",
+                "selectedOptionId": "correct" if i % 2 == 0 else "opt1",
+                "reactionTimeMs": 800 + i * 100,
+            }
+            for i in range(3)
+        ]
 
         response = client.post(
-            "/api/v1/speedcongruency/submit",
-            json={
-                "trialIndex": 0,
-                "trigger": "BLUE",
-                "selectedOptionId": "opt1",
-                "reactionTimeMs": 1250.7,
-                "testDataId": test_data_id,
-                "stimulusId": stimulus_id,
-            },
+            "/api/v1/speedcongruency/submit_bulk", json={"trials": trials}
         )
-
         assert response.status_code == 200
-        data = response.get_json()
-        assert data["ok"] is True
-        assert data["matched"] is False
+        assert response.get_json()["matched"] == [True, False, True]
 
-    def test_submit_no_authentication(self, client):
-        response = client.post(
-            "/api/v1/speedcongruency/submit",
-            json={
-                "trialIndex": 0,
-                "trigger": "TEST",
-                "selectedOptionId": "correct",
-                "reactionTimeMs": 800,
-            },
+        count = db.session.scalar(
+            select(func.count())
+            .select_from(SpeedCongruency)
+            .where(SpeedCongruency.participant_id == str(session_participant.id))
         )
-        assert response.status_code == 401
+        assert count == 3
 
-    def test_submit_no_reaction_time(self, client, app, sample_participant):
-        with client.session_transaction() as sess:
-            sess["user_id"] = sample_participant.id
-            sess["user_role"] = "participant"
+    @pytest.mark.parametrize("path", ["submit_bulk", "submit"])
+    @pytest.mark.parametrize("id_type", [int, str], ids=["int-id", "string-id"])
+    def test_submit_bulk_expected_color(
+        self, client, login, session_participant, session_testdata, path, id_type
+    ):
+        """A trials list resolves the stimulus color for int and numeric-string ids"""
+        login(session_participant.id)
+        test_data_id = id_type(session_testdata.id)
 
         response = client.post(
-            "/api/v1/speedcongruency/submit",
-            json={
-                "trialIndex": 0,
-                "trigger": "TEST",
-                "selectedOptionId": "correct",
-                "testDataId": 1,
-                "stimulusId": 1,
-            },
+            f"/api/v1/speedcongruency/{path}",
+            json={"trials": [{**SUBMIT_TEMPLATE, "testDataId": test_data_id}]},
         )
         assert response.status_code == 200
-        data = response.get_json()
-        assert data["ok"] is True
 
-        with app.app_context():
-            record = SpeedCongruency.query.filter_by(
-                participant_id=str(sample_participant.id)
-            ).first()
-            assert record.response_ms is None
-
-    def test_submit_with_meta_json(
-        self, client, app, sample_participant, sample_researcher
-    ):
-        with app.app_context():
-            stimulus = ColorStimulus(
-                description="Y",
-                r=100,
-                g=150,
-                b=200,
-                trigger_type="letter",
-                owner_researcher_id=sample_researcher.id,
-            )
-            db.session.add(stimulus)
-            db.session.commit()
-
-            td = TestData(
-                user_id=str(sample_participant.id),
-                family="color",
-                cct_valid=1,
-                cct_pass=True,
-                stimulus_id=stimulus.id,
-            )
-            db.session.add(td)
-            db.session.commit()
-            test_data_id = td.id
-
-        with client.session_transaction() as sess:
-            sess["user_id"] = sample_participant.id
-            sess["user_role"] = "participant"
+        row = db.session.execute(
+            select(
+                SpeedCongruency.expected_r,
+                SpeedCongruency.expected_g,
+                SpeedCongruency.expected_b,
+                SpeedCongruency.meta_json,
+            ).where(SpeedCongruency.participant_id == str(session_participant.id))
+        ).one()
+        assert tuple(row) == (255, 179, 71, {"test_data_id": test_data_id})
+
+    def test_submit_accepts_trials_list(self, client, login, session_participant):
+        """/submit with a trials list takes the bulk path"""
+        login(session_participant.id)
+        trials = [{**SUBMIT_TEMPLATE, "trialIndex": i} for i in range(2)]
 
         response = client.post(
-            "/api/v1/speedcongruency/submit",
-            json={
-                "trialIndex": 0,
-                "trigger": "Y",
-                "selectedOptionId": "correct",
-                "reactionTimeMs": 900,
-                "testDataId": test_data_id,
-                "stimulusId": 1,
-            },
+            "/api/v1/speedcongruency/submit", json={"trials": trials}
         )
         assert response.status_code == 200
+        assert response.get_json()["count"] == 2
 
-        with app.app_context():
-            record = SpeedCongruency.query.filter_by(
-                participant_id=str(sample_participant.id)
-            ).first()
-            assert record.meta_json is not None
-            assert record.meta_json["test_data_id"] == test_data_id
-
-    def test_submit_multiple_trials(self, client, app, sample_participant):
-        with client.session_transaction() as sess:
-            sess["user_id"] = sample_participant.id
-            sess["user_role"] = "participant"
-
-        for i in range(3):
-            response = client.post(
-                "/api/v1/speedcongruency/submit",
-                json={
-                    "trialIndex": i,
-                    "trigger": f"TRIGGER_{i}",
-                    "selectedOptionId": "correct" if i % 2 == 0 else "opt1",
-                    "reactionTimeMs": 800 + i * 100,
-                    "testDataId": 1,
-                    "stimulusId": 1,
-                },
-            )
-            assert response.status_code == 200
-
-        with app.app_context():
-            records = SpeedCongruency.query.filter_by(
-                participant_id=str(sample_participant.id)
-            ).all()
-            assert len(records) == 3
-
-    def test_submit_expected_color_from_stimulus(
-        self, client, app, sample_participant, sample_researcher
+    def test_submit_trials_list_rejects_malformed_trial(
+        self, client, login, session_participant
     ):
-        with app.app_context():
-            stimulus = ColorStimulus(
-                description="ORANGE",
-                r=255,
-                g=179,
-                b=71,
-                trigger_type="word",
-                owner_researcher_id=sample_researcher.id,
-            )
-            db.session.add(stimulus)
-            db.session.commit()
-
-            td = TestData(
-                user_id=str(sample_participant.id),
-                family="color",
-                cct_valid=1,
-                cct_pass=True,
-                stimulus_id=stimulus.id,
-            )
-            db.session.add(td)
-            db.session.commit()
-            test_data_id = td.id
-
-        with client.session_transaction() as sess:
-            sess["user_id"] = sample_participant.id
-            sess["user_role"] = "participant"
+        """/submit validates a trials list the same way /submit_bulk does"""
+        login(session_participant.id)
+        trials = [dict(SUBMIT_TEMPLATE), {**SUBMIT_TEMPLATE, "reactionTimeMs": "x"}]
 
         response = client.post(
-            "/api/v1/speedcongruency/submit",
-            json={
-                "trialIndex": 0,
-                "trigger": "ORANGE",
-                "selectedOptionId": "correct",
-                "reactionTimeMs": 750,
-                "testDataId": test_data_id,
-                "stimulusId": 1,
-            },
+            "/api/v1/speedcongruency/submit", json={"trials": trials}
         )
-        assert response.status_code == 200
+        assert response.status_code == 400
+        assert response.get_json()["error"].startswith("trials[1]")
+        assert db.session.scalar(select(func.count(SpeedCongruency.id))) == 0
 
-        with app.app_context():
-            record = SpeedCongruency.query.filter_by(
-                participant_id=str(sample_participant.id)
-            ).first()
-            assert record.expected_r == 255
-            assert record.expected_g == 179
-            assert record.expected_b == 71
-
-    def test_submit_cue_type_default(self, client, app, sample_participant):
-        with client.session_transaction() as sess:
-            sess["user_id"] = sample_participant.id
-            sess["user_role"] = "participant"
+    @pytest.mark.parametrize("body", [{}, {"trials": []}, {"trials": "nope"}])
+    def test_submit_bulk_requires_trials(
+        self, client, login, session_participant, body
+    ):
+        login(session_participant.id)
+
+        response = client.post("/api/v1/speedcongruency/submit_bulk", json=body)
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize(
+        "bad_trial,reason",
+        [
+            (None, "must be an object"),
+            ("trial", "must be an object"),
+            ({**SUBMIT_TEMPLATE, "testDataId": [1]}, "testDataId"),
+            ({**SUBMIT_TEMPLATE, "testDataId": "abc"}, "testDataId"),
+            ({**SUBMIT_TEMPLATE, "reactionTimeMs": "fast"}, "reactionTimeMs"),
+        ],
+        ids=[
+            "null",
+            "string",
+            "list-testDataId",
+            "text-testDataId",
+            "text-reactionTimeMs",
+        ],
+    )
+    def test_submit_bulk_rejects_malformed_trial(
+        self, client, login, session_participant, bad_trial, reason
+    ):
+        """A malformed element is a 400 naming it, and no trial is stored"""
+        login(session_participant.id)
 
         response = client.post(
+            "/api/v1/speedcongruency/submit_bulk",
+            json={"trials": [dict(SUBMIT_TEMPLATE), bad_trial]},
+        )
+        assert response.status_code == 400
+        error = response.get_json()["error"]
+        assert error.startswith("trials[1]") and reason in error
+        assert db.session.scalar(select(func.count(SpeedCongruency.id))) == 0
+
+
+class TestSpeedCongruencyUnauthenticated:
+    """Requests rejected by _require_participant never reach the database"""
+
+    @pytest.fixture(autouse=True)
+    def setup_database(self):
+        """Override the autouse create_all/drop_all: no tables needed here"""
+        yield
+
+    @pytest.fixture
+    def client_no_db(self):
+        """Client for a bare app with only the speed-congruency blueprint"""
+        app_no_db = Flask(__name__)
+        app_no_db.config["TESTING"] = True
+        app_no_db.config["SECRET_KEY"] = "test-secret-key"
+        app_no_db.register_blueprint(bp, url_prefix="/api/v1/speedcongruency/")
+        return app_no_db.test_client()
+
+    def test_require_participant_no_session(self, client_no_db):
+        """No session → 401"""
+        response = client_no_db.get("/api/v1/speedcongruency/next")
+        assert response.status_code == 401
+        data = response.get_json()
+        assert "Not authenticated" in data["error"]
+
+    def test_submit_no_authentication(self, client_no_db):
+        response = client_no_db.post(
             "/api/v1/speedcongruency/submit",
             json={
-                "trialIndex": 0,
-                "trigger": "TEST",
-                "selectedOptionId": "correct",
-                "reactionTimeMs": 850,
-                "testDataId": 1,
-                "stimulusId": 1,
-                # No cue_type provided
+                **SUBMIT_TEMPLATE,
+                "reactionTimeMs": 800,
             },
         )
-        assert response.status_code == 200
-
-        with app.app_context():
-            record = SpeedCongruency.query.filter_by(
-                participant_id=str(sample_participant.id)
-            ).first()
-            assert record.cue_type == "word"
+        assert response.status_code == 401
@@ -4,8 +4,67 @@ Tests cover: authentication, trial saving, batch operations, error handling
 Target: 95%+ branch coverage for colortest.py
 """
 
+import json
+import pytest
+import sqlalchemy as sa
+from types import MappingProxyType
 from models import db, ColorTrial
-from datetime import datetime, timezone
+
+# meta_json timestamps are opaque to the API; any ISO string will do
+_FIXED_TS = "2024-01-01T00:00:00+00:00"
+
+# Grey trial used wherever only the endpoint's status handling is under test
+_RGB_100 = MappingProxyType({"selected_r": 100, "selected_g": 100, "selected_b": 100})
+_RGB_100_BYTES = json.dumps(dict(_RGB_100)).encode()
+_RGB_100_BATCH_BYTES = json.dumps({"trials": [dict(_RGB_100)]}).encode()
+
+# Generated trials for the batch-size tests, encoded once per batch size
+_GENERATED_TRIALS = tuple(
+    {
+        "trial_index": i,
+        "selected_r": (i * 10) & 255,
+        "selected_g": (i * 20) & 255,
+        "selected_b": (i * 30) & 255,
+        "response_ms": 800 + (i * 50),
+    }
+    for i in range(50)
+)
+_GENERATED_BATCH_BYTES = {
+    n: json.dumps({"trials": _GENERATED_TRIALS[:n]}).encode() for n in (10, 50)
+}
+
+
+def _fetch_trial(trial_id):
+    """
+    ColorTrial by id for column checks. session.get returns an identity-map hit
+    without a SELECT; on a miss, lazyload skips the joined stimulus/owner load.
+    """
+    return db.session.get(ColorTrial, trial_id, options=[sa.orm.lazyload("*")])
+
+
+def _count(session):
+    """Number of ColorTrial rows, as one COUNT(*) without loading instances"""
+    return session.execute(sa.select(sa.func.count(ColorTrial.id))).scalar()
+
+
+@pytest.fixture(scope="module")
+def db_connection(db_module_connection):
+    """Share one outer transaction across the whole module"""
+    return db_module_connection
+
+
+@pytest.fixture(scope="module")
+def client(app):
+    """One test client for the module; setup_database clears its session cookie"""
+    return app.test_client()
+
+
+@pytest.fixture(autouse=True)
+def setup_database(app, client, db_savepoint):
+    """Roll back each test's rows instead of dropping and recreating tables"""
+    yield
+    # Tests that set the session by hand must not leak it into the next test
+    client.delete_cookie(app.config["SESSION_COOKIE_NAME"])
 
 
 class TestSaveColorTrial:
@@ -32,7 +91,7 @@ class TestSaveColorTrial:
         assert data["trial"]["selected_r"] == 255
 
         # Verify database record - using db.session.get instead of query.get
-        trial = db.session.get(ColorTrial, data["trial_id"])
+        trial = _fetch_trial(data["trial_id"])
         assert trial is not None
         assert trial.selected_r == 255
         assert trial.response_ms == 1200
@@ -48,7 +107,7 @@ class TestSaveColorTrial:
         assert data["success"] is True
 
         # Verify optional fields are None
-        trial = db.session.get(ColorTrial, data["trial_id"])
+        trial = _fetch_trial(data["trial_id"])
         assert trial.trial_index is None
         assert trial.response_ms is None
 
@@ -66,7 +125,7 @@ class TestSaveColorTrial:
                 "stimulus": "C#",
                 "browser": "Chrome",
                 "screen_width": 1920,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": _FIXED_TS,
             },
         }
 
@@ -74,30 +133,26 @@ class TestSaveColorTrial:
 
         assert response.status_code == 201
         data = response.get_json()
-        trial = db.session.get(ColorTrial, data["trial_id"])
+        trial = _fetch_trial(data["trial_id"])
         assert trial.meta_json["test_type"] == "music"
         assert trial.meta_json["stimulus"] == "C#"
 
-    def test_save_trial_unauthenticated(self, client):
+    def test_save_trial_unauthenticated(self, post_json):
         """Test trial save fails without authentication"""
-        trial_data = {"selected_r": 100, "selected_g": 100, "selected_b": 100}
-
-        response = client.post("/api/v1/color-test/trial", json=trial_data)
+        response = post_json("/api/v1/color-test/trial", _RGB_100_BYTES)
 
         assert response.status_code == 401
         data = response.get_json()
         assert "error" in data
         assert data["error"] == "Not authenticated"
 
-    def test_save_trial_invalid_participant(self, client, app):
+    def test_save_trial_invalid_participant(self, client, post_json):
         """Test trial save with invalid participant ID in session"""
         with client.session_transaction() as sess:
             sess["user_id"] = 99999  # Non-existent participant
             sess["user_role"] = "participant"
 
-        trial_data = {"selected_r": 100, "selected_g": 100, "selected_b": 100}
-
-        response = client.post("/api/v1/color-test/trial", json=trial_data)
+        response = post_json("/api/v1/color-test/trial", _RGB_100_BYTES)
 
         assert response.status_code == 404
         data = response.get_json()
@@ -109,7 +164,7 @@ class TestSaveColorTrial:
 
         assert response.status_code == 201  # Should succeed with None values
         data = response.get_json()
-        trial = db.session.get(ColorTrial, data["trial_id"])
+        trial = _fetch_trial(data["trial_id"])
         assert trial.selected_r is None
 
     def test_save_trial_invalid_json(self, client, auth_participant):
@@ -122,23 +177,23 @@ class TestSaveColorTrial:
 
         assert response.status_code == 400 or response.status_code == 500
 
-    def test_save_trial_boundary_rgb_values(self, client, auth_participant):
+    @pytest.mark.parametrize("r,g,b", [(0, 255, 128), (255, 0, 0), (0, 0, 255)])
+    def test_save_trial_boundary_rgb_values(self, client, auth_participant, r, g, b):
         """Test trial save with boundary RGB values (0 and 255)"""
-        trial_data = {"selected_r": 0, "selected_g": 255, "selected_b": 128}
+        trial_data = {"selected_r": r, "selected_g": g, "selected_b": b}
 
         response = client.post("/api/v1/color-test/trial", json=trial_data)
 
         assert response.status_code == 201
         data = response.get_json()
-        trial = db.session.get(ColorTrial, data["trial_id"])
-        assert trial.selected_r == 0
-        assert trial.selected_g == 255
+        trial = _fetch_trial(data["trial_id"])
+        assert (trial.selected_r, trial.selected_g, trial.selected_b) == (r, g, b)
 
 
 class TestSaveColorTrialsBatch:
     """Test suite for POST /api/v1/color-test/batch endpoint"""
 
-    def test_batch_save_multiple_trials(self, client, auth_participant):
+    def test_batch_save_multiple_trials(self, post_json, auth_participant):
         """Test saving multiple trials in one request"""
         batch_data = {
             "trials": [
@@ -169,7 +224,7 @@ class TestSaveColorTrialsBatch:
             ]
         }
 
-        response = client.post("/api/v1/color-test/batch", json=batch_data)
+        response = post_json("/api/v1/color-test/batch", batch_data)
 
         assert response.status_code == 201
         data = response.get_json()
@@ -178,8 +233,10 @@ class TestSaveColorTrialsBatch:
         assert len(data["trial_ids"]) == 3
 
         # Verify all trials in database
-        trials = ColorTrial.query.filter(ColorTrial.id.in_(data["trial_ids"])).all()
-        assert len(trials) == 3
+        saved = db.session.execute(
+            sa.select(sa.func.count()).where(ColorTrial.id.in_(data["trial_ids"]))
+        ).scalar()
+        assert saved == 3
 
     def test_batch_save_empty_list(self, client, auth_participant):
         """Test batch save with empty trials list"""
@@ -204,48 +261,36 @@ class TestSaveColorTrialsBatch:
         data = response.get_json()
         assert data["count"] == 1
 
-    def test_batch_save_unauthenticated(self, client):
+    def test_batch_save_unauthenticated(self, post_json):
         """Test batch save fails without authentication"""
-        batch_data = {
-            "trials": [{"selected_r": 100, "selected_g": 100, "selected_b": 100}]
-        }
-
-        response = client.post("/api/v1/color-test/batch", json=batch_data)
+        response = post_json("/api/v1/color-test/batch", _RGB_100_BATCH_BYTES)
 
         assert response.status_code == 401
         assert "error" in response.get_json()
 
-    def test_batch_save_large_batch(self, client, auth_participant):
-        """Test batch save with many trials (stress test)"""
-        trials = [
-            {
-                "trial_index": i,
-                "selected_r": (i * 10) % 256,
-                "selected_g": (i * 20) % 256,
-                "selected_b": (i * 30) % 256,
-                "response_ms": 800 + (i * 50),
-            }
-            for i in range(50)  # 50 trials
-        ]
-        batch_data = {"trials": trials}
-
-        response = client.post("/api/v1/color-test/batch", json=batch_data)
+    def _post_generated_batch(self, post_json, n):
+        response = post_json("/api/v1/color-test/batch", _GENERATED_BATCH_BYTES[n])
 
         assert response.status_code == 201
         data = response.get_json()
-        assert data["count"] == 50
+        assert data["count"] == n
+
+    def test_batch_save_medium_batch(self, post_json, auth_participant):
+        """Test batch save with a representative number of trials"""
+        self._post_generated_batch(post_json, 10)
+
+    @pytest.mark.slow
+    def test_batch_save_large_batch(self, post_json, auth_participant):
+        """Test batch save with many trials (stress test)"""
+        self._post_generated_batch(post_json, 50)
 
-    def test_batch_save_invalid_participant(self, client):
+    def test_batch_save_invalid_participant(self, client, post_json):
         """Test batch save with invalid participant ID"""
         with client.session_transaction() as sess:
             sess["user_id"] = 99999  # Non-existent participant
             sess["user_role"] = "participant"
 
-        batch_data = {
-            "trials": [{"selected_r": 100, "selected_g": 100, "selected_b": 100}]
-        }
-
-        response = client.post("/api/v1/color-test/batch", json=batch_data)
+        response = post_json("/api/v1/color-test/batch", _RGB_100_BATCH_BYTES)
 
         assert response.status_code == 404
         data = response.get_json()
@@ -269,19 +314,17 @@ class TestStartTestSession:
         assert data["session"]["participant_id"] == sample_participant.participant_id
         assert "started_at" in data["session"]
 
-    def test_start_session_different_test_types(self, client, auth_participant):
+    @pytest.mark.parametrize("test_type", ["letter", "number", "word", "music"])
+    def test_start_session_different_test_types(
+        self, client, auth_participant, test_type
+    ):
         """Test starting sessions for different test types"""
-        test_types = ["letter", "number", "word", "music"]
-
-        for test_type in test_types:
-            session_data = {"test_type": test_type}
-            response = client.post(
-                "/api/v1/color-test/session/start", json=session_data
-            )
+        session_data = {"test_type": test_type}
+        response = client.post("/api/v1/color-test/session/start", json=session_data)
 
-            assert response.status_code == 200
-            data = response.get_json()
-            assert data["session"]["test_type"] == test_type
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["session"]["test_type"] == test_type
 
     def test_start_session_no_test_type(self, client, auth_participant):
         """Test session start without test_type"""
@@ -319,7 +362,7 @@ class TestStartTestSession:
 class TestColorTestIntegration:
     """Integration tests for complete color test workflows"""
 
-    def test_complete_letter_test_workflow(self, client, auth_participant):
+    def test_complete_letter_test_workflow(self, client, post_json, auth_participant):
         """Test complete workflow: start session -> save trials -> verify data"""
         # 1. Start session
         session_response = client.post(
@@ -327,7 +370,7 @@ class TestColorTestIntegration:
         )
         assert session_response.status_code == 200
 
-        # 2. Save individual trials
+        # 2. Save the trials in one batch
         letters = ["A", "B", "C", "D", "E"]
         colors = [
             (255, 0, 0),  # Red for A
@@ -337,9 +380,8 @@ class TestColorTestIntegration:
             (255, 0, 255),  # Magenta for E
         ]
 
-        trial_ids = []
-        for idx, (letter, (r, g, b)) in enumerate(zip(letters, colors), 1):
-            trial_data = {
+        trials = [
+            {
                 "trial_index": idx,
                 "selected_r": r,
                 "selected_g": g,
@@ -347,36 +389,35 @@ class TestColorTestIntegration:
                 "response_ms": 1000 + (idx * 100),
                 "meta_json": {"test_type": "letter", "stimulus": letter},
             }
-            response = client.post("/api/v1/color-test/trial", json=trial_data)
-            assert response.status_code == 201
-            trial_ids.append(response.get_json()["trial_id"])
+            for idx, (letter, (r, g, b)) in enumerate(zip(letters, colors), 1)
+        ]
+        response = post_json("/api/v1/color-test/batch", {"trials": trials})
+        assert response.status_code == 201
+        trial_ids = response.get_json()["trial_ids"]
 
         # 3. Verify all trials saved
-        assert len(trial_ids) == 5
-        trials = ColorTrial.query.filter(ColorTrial.id.in_(trial_ids)).all()
-        assert len(trials) == 5
+        assert len(set(trial_ids)) == 5
 
-    def test_music_test_batch_workflow(self, client, auth_participant):
+    def test_music_test_batch_workflow(self, client, post_json, auth_participant):
         """Test music test using batch endpoint"""
         # Start session
         client.post("/api/v1/color-test/session/start", json={"test_type": "music"})
 
         # Create batch of music note trials
         notes = ["C", "D", "E", "F", "G", "A", "B"]
-        trials = []
-        for idx, note in enumerate(notes, 1):
-            trials.append(
-                {
-                    "trial_index": idx,
-                    "selected_r": (idx * 35) % 256,
-                    "selected_g": (idx * 70) % 256,
-                    "selected_b": (idx * 105) % 256,
-                    "response_ms": 800 + (idx * 75),
-                    "meta_json": {"test_type": "music", "stimulus": note, "octave": 4},
-                }
-            )
-
-        response = client.post("/api/v1/color-test/batch", json={"trials": trials})
+        trials = [
+            {
+                "trial_index": idx,
+                "selected_r": (idx * 35) & 255,
+                "selected_g": (idx * 70) & 255,
+                "selected_b": (idx * 105) & 255,
+                "response_ms": 800 + (idx * 75),
+                "meta_json": {"test_type": "music", "stimulus": note, "octave": 4},
+            }
+            for idx, note in enumerate(notes, 1)
+        ]
+
+        response = post_json("/api/v1/color-test/batch", {"trials": trials})
         assert response.status_code == 201
         assert response.get_json()["count"] == 7
 
@@ -388,7 +429,7 @@ class TestErrorHandling:
         """Test database rollback on error"""
         # This would require mocking db.session.commit to raise an exception
         # Simplified version - test that invalid data doesn't persist
-        initial_count = ColorTrial.query.count()
+        initial_count = _count(db.session)
 
         # Try to save with potentially problematic data
         trial_data = {
@@ -403,10 +444,10 @@ class TestErrorHandling:
         assert response.status_code >= 400
 
         # Verify no partial data saved
-        final_count = ColorTrial.query.count()
+        final_count = _count(db.session)
         assert final_count == initial_count
 
-    def test_concurrent_trial_saves(self, client, auth_participant):
+    def test_concurrent_trial_saves(self, post_json, auth_participant):
         """Test multiple trials can be saved concurrently (sequential test)"""
         trial_data = {
             "trial_index": 1,
@@ -416,71 +457,33 @@ class TestErrorHandling:
         }
 
         # Save same trial data multiple times
-        responses = []
-        for _ in range(3):
-            response = client.post("/api/v1/color-test/trial", json=trial_data)
-            responses.append(response)
+        response = post_json("/api/v1/color-test/batch", {"trials": [trial_data] * 3})
 
         # All should succeed and create separate records
-        assert all(r.status_code == 201 for r in responses)
-        trial_ids = [r.get_json()["trial_id"] for r in responses]
+        assert response.status_code == 201
+        trial_ids = response.get_json()["trial_ids"]
         assert len(set(trial_ids)) == 3  # All unique IDs
 
-    def test_save_trial_exception_handling(self, client, auth_participant, monkeypatch):
-        """Test that exceptions in save_color_trial are handled properly"""
-        import models
-
-        # Mock db.session.commit to raise an exception
-        def mock_commit():
-            raise Exception("Database error")
-
-        monkeypatch.setattr(models.db.session, "commit", mock_commit)
-
-        trial_data = {"selected_r": 100, "selected_g": 100, "selected_b": 100}
-
-        response = client.post("/api/v1/color-test/trial", json=trial_data)
-
-        # Should return 500 error
-        assert response.status_code == 500
-        data = response.get_json()
-        assert data["success"] is False
-
-    def test_batch_save_exception_handling(self, client, auth_participant, monkeypatch):
-        """Test that exceptions in batch save are handled properly"""
-        import models
-
-        # Mock db.session.commit to raise an exception
-        def mock_commit():
-            raise Exception("Database error")
-
-        monkeypatch.setattr(models.db.session, "commit", mock_commit)
-
-        batch_data = {
-            "trials": [{"selected_r": 100, "selected_g": 100, "selected_b": 100}]
-        }
-
-        response = client.post("/api/v1/color-test/batch", json=batch_data)
-
-        # Should return 500 error
-        assert response.status_code == 500
-        data = response.get_json()
-        assert data["success"] is False
-
-    def test_start_session_exception_handling(
-        self, client, auth_participant, monkeypatch
+    @pytest.mark.parametrize(
+        "endpoint,payload,patch_target",
+        [
+            ("/api/v1/color-test/trial", _RGB_100_BYTES, "commit"),
+            ("/api/v1/color-test/batch", _RGB_100_BATCH_BYTES, "commit"),
+            ("/api/v1/color-test/session/start", {"test_type": "letter"}, "get"),
+        ],
+        ids=["trial", "batch", "session_start"],
+    )
+    def test_exception_handling(
+        self, post_json, auth_participant, monkeypatch, endpoint, payload, patch_target
     ):
-        """Test that exceptions in start_test_session are handled properly"""
-        import models
+        """Test that a failing db.session call is reported as a 500"""
 
-        # Mock db.session.get to raise an exception
-        def mock_get(model_class, id):
+        def raise_db_error(*args, **kwargs):
             raise Exception("Database error")
 
-        monkeypatch.setattr(models.db.session, "get", mock_get)
+        monkeypatch.setattr(db.session, patch_target, raise_db_error)
 
-        session_data = {"test_type": "letter"}
-
-        response = client.post("/api/v1/color-test/session/start", json=session_data)
+        response = post_json(endpoint, payload)
 
         # Should return 500 error
         assert response.status_code == 500
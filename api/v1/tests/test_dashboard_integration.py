@@ -4,8 +4,13 @@ Tests how color test data appears in participant dashboards
 Target: Coverage of dashboard.py color test integration
 """
 
+import pytest
+from sqlalchemy import event, insert
+from werkzeug.test import EnvironBuilder
 from models import (
     db,
+    Participant,
+    Researcher,
     TestResult,
     Test,
     ScreeningSession,
@@ -13,206 +18,278 @@ from models import (
 )
 from datetime import datetime, timezone
 
+from .conftest import _password_hash
 
-class TestDashboardColorTestIntegration:
-    """Test dashboard endpoints with color test data"""
+DASHBOARD_URL = "/api/v1/participant/dashboard/"
+# Frozen clock for completed_at/started_at values set by the tests
+_NOW = datetime(2024, 12, 1, tzinfo=timezone.utc)
 
-    def test_dashboard_with_no_tests(self, client, auth_participant):
-        """Test dashboard for participant with no test results"""
-        response = client.get("/api/v1/participant/dashboard/")
 
-        assert response.status_code == 200
-        data = response.get_json()
+# Built once; the client copies its environ and adds cookies on every open()
+_DASHBOARD_REQUEST = EnvironBuilder(path=DASHBOARD_URL).get_request()
 
-        assert data["tests_completed"] == 0
-        assert data["tests_pending"] == 0
-        assert data["completion_percentage"] == 0
 
-    def test_dashboard_with_completed_color_tests(
-        self, client, auth_participant, sample_test, app
-    ):
-        """Test dashboard shows completed color tests"""
-        with app.app_context():
-            # Create completed test result
-            result = TestResult(
-                participant_id=auth_participant.id,
-                test_id=sample_test.id,
-                status="completed",
-                consistency_score=0.85,
-                completed_at=datetime.now(timezone.utc),
-            )
-            db.session.add(result)
-            db.session.commit()
+def _get_dashboard(client):
+    """GET the dashboard with the response body read up front"""
+    return client.open(_DASHBOARD_REQUEST, buffered=True)
 
-        response = client.get("/api/v1/participant/dashboard/")
 
-        assert response.status_code == 200
-        data = response.get_json()
+def _make_screening(
+    session, participant_id, *, status="completed", eligible=True, **fields
+):
+    """Add a ScreeningSession and flush so its id is available"""
+    screening = ScreeningSession(
+        participant_id=participant_id, status=status, eligible=eligible, **fields
+    )
+    session.add(screening)
+    session.flush()
+    return screening
 
-        assert data["tests_completed"] == 1
-        assert data["completion_percentage"] > 0
 
-    def test_dashboard_with_pending_tests(
-        self, client, auth_participant, sample_test, app
-    ):
-        """Test dashboard shows pending color tests"""
-        with app.app_context():
-            # Create not_started test result
-            result = TestResult(
-                participant_id=auth_participant.id,
-                test_id=sample_test.id,
-                status="not_started",
-            )
-            db.session.add(result)
-            db.session.commit()
+def _add_recs(session, screening_id, recs):
+    """Insert ScreeningRecommendedTest rows for one screening in one statement"""
+    session.execute(
+        insert(ScreeningRecommendedTest),
+        [{"session_id": screening_id, **rec} for rec in recs],
+    )
+
+
+@pytest.fixture(scope="module")
+def db_connection(db_module_connection):
+    """Share one outer transaction across the whole module"""
+    return db_module_connection
+
+
+@pytest.fixture(scope="module")
+def client(app):
+    """One test client for the module; setup_database clears its session cookie"""
+    return app.test_client()
+
+
+@pytest.fixture(autouse=True)
+def setup_database(request, app, client):
+    """Roll back each test's rows instead of dropping and recreating tables"""
+    if not request.node.get_closest_marker("no_db"):
+        request.getfixturevalue("db_savepoint")
+    yield
+    # Tests that set the session by hand must not leak it into the next test
+    client.delete_cookie(app.config["SESSION_COOKIE_NAME"])
+
+
+@pytest.fixture(scope="module")
+def module_users(app, db_connection):
+    """Participant and researcher hashed and inserted once per module"""
+    with app.app_context():
+        # The rows outlive this context; keep their loaded attributes on commit
+        db.session().expire_on_commit = False
+        participant = Participant(
+            participant_id="P_TEST_001",
+            name="Test Participant",
+            email="test@example.com",
+            password_hash=_password_hash("password123"),
+            age=25,
+            country="USA",
+            screening_completed=False,
+            status="active",
+        )
+        researcher = Researcher(
+            name="Dr. Test",
+            email="researcher@example.com",
+            password_hash=_password_hash("research123"),
+            institution="Test University",
+        )
+        db.session.add_all([participant, researcher])
+        db.session.commit()
+        return participant, researcher
 
-        response = client.get("/api/v1/participant/dashboard/")
+
+@pytest.fixture
+def sample_participant(module_users, db_session):
+    """Module-scoped participant re-attached to this test's session"""
+    return db_session.merge(module_users[0], load=False)
+
+
+@pytest.fixture
+def sample_researcher(module_users, db_session):
+    """Module-scoped researcher re-attached to this test's session"""
+    return db_session.merge(module_users[1], load=False)
+
+
+class TestDashboardColorTestIntegration:
+    """Test dashboard endpoints with color test data"""
+
+    def test_dashboard_with_no_tests(self, client, auth_participant):
+        """Test dashboard for participant with no test results"""
+        response = _get_dashboard(client)
 
         assert response.status_code == 200
         data = response.get_json()
 
-        assert data["tests_pending"] >= 1
         assert data["tests_completed"] == 0
+        assert data["tests_pending"] == 0
+        assert data["completion_percentage"] == 0
 
-    def test_dashboard_with_in_progress_tests(
-        self, client, auth_participant, sample_test, app
+    @pytest.mark.parametrize(
+        "status,extra,completed,pending",
+        [
+            (
+                "completed",
+                {"consistency_score": 0.85, "completed_at": _NOW},
+                1,
+                0,
+            ),
+            ("not_started", {}, 0, 1),
+            # in_progress counts as pending
+            ("in_progress", {"started_at": _NOW}, 0, 1),
+        ],
+    )
+    def test_dashboard_status_counts(
+        self,
+        client,
+        auth_participant,
+        sample_test,
+        db_session,
+        status,
+        extra,
+        completed,
+        pending,
     ):
-        """Test dashboard counts in_progress tests as pending"""
-        with app.app_context():
-            result = TestResult(
+        """Test dashboard counts a color test result by its status"""
+        db_session.add(
+            TestResult(
                 participant_id=auth_participant.id,
                 test_id=sample_test.id,
-                status="in_progress",
-                started_at=datetime.now(timezone.utc),
+                status=status,
+                **extra,
             )
-            db.session.add(result)
-            db.session.commit()
+        )
+        db_session.commit()
 
-        response = client.get("/api/v1/participant/dashboard/")
+        response = _get_dashboard(client)
 
         assert response.status_code == 200
         data = response.get_json()
 
-        assert data["tests_pending"] >= 1
+        assert data["tests_completed"] == completed
+        assert data["tests_pending"] == pending
+        assert data["completion_percentage"] == 100 * completed
 
     def test_dashboard_completion_percentage_calculation(
-        self, client, auth_participant, app
+        self, client, auth_participant, db_session
     ):
         """Test completion percentage calculation"""
-        with app.app_context():
-            # Create multiple tests
-            tests = []
-            for i in range(4):
-                test = Test(
-                    name=f"Color Test {i}",
-                    synesthesia_type="Grapheme-Color",
-                    duration=10,
-                )
-                tests.append(test)
-                db.session.add(test)
-            db.session.commit()
-
-            # 2 completed, 2 not started
-            for i, test in enumerate(tests):
-                status = "completed" if i < 2 else "not_started"
-                result = TestResult(
-                    participant_id=auth_participant.id, test_id=test.id, status=status
-                )
-                db.session.add(result)
-            db.session.commit()
-
-        response = client.get("/api/v1/participant/dashboard/")
+        # Create multiple tests
+        test_ids = db_session.scalars(
+            insert(Test).returning(Test.id, sort_by_parameter_order=True),
+            [
+                {
+                    "name": f"Color Test {i}",
+                    "synesthesia_type": "Grapheme-Color",
+                    "duration": 10,
+                }
+                for i in range(4)
+            ],
+        ).all()
+
+        # 2 completed, 2 not started
+        db_session.execute(
+            insert(TestResult),
+            [
+                {
+                    "participant_id": auth_participant.id,
+                    "test_id": test_id,
+                    "status": "completed" if i < 2 else "not_started",
+                }
+                for i, test_id in enumerate(test_ids)
+            ],
+        )
+        db_session.commit()
+
+        response = _get_dashboard(client)
         data = response.get_json()
 
         # 2/4 = 50%
         assert data["completion_percentage"] == 50
 
+    @pytest.mark.no_db
     def test_dashboard_unauthenticated(self, client):
         """Test dashboard requires authentication"""
-        response = client.get("/api/v1/participant/dashboard/")
+        response = _get_dashboard(client)
 
         assert response.status_code == 401
         data = response.get_json()
         assert "error" in data
 
     def test_dashboard_recommended_tests_from_screening(
-        self, client, auth_participant, sample_test, app
+        self, client, auth_participant, sample_test, db_session, sql_counter
     ):
         """Test dashboard shows recommended tests from screening"""
-        with app.app_context():
-            # Create completed screening session
-            screening = ScreeningSession(
-                participant_id=auth_participant.id,
-                status="completed",
-                eligible=True,
-                consent_given=True,
-                completed_at=datetime.now(timezone.utc),
-            )
-            db.session.add(screening)
-            db.session.commit()
-
-            # Add recommended test
-            rec = ScreeningRecommendedTest(
-                session_id=screening.id,
-                position=1,
-                suggested_name="Grapheme-Color Test",
-                reason="You indicated grapheme-color experiences",
-                test_id=sample_test.id,
-            )
-            db.session.add(rec)
-            db.session.commit()
-
-        response = client.get("/api/v1/participant/dashboard/")
+        # Completed screening session with one recommended test
+        screening = _make_screening(
+            db_session,
+            auth_participant.id,
+            consent_given=True,
+            completed_at=_NOW,
+        )
+        _add_recs(
+            db_session,
+            screening.id,
+            [
+                {
+                    "position": 1,
+                    "suggested_name": "Grapheme-Color Test",
+                    "reason": "You indicated grapheme-color experiences",
+                    "test_id": sample_test.id,
+                }
+            ],
+        )
+        db_session.commit()
+        test_id, duration = sample_test.id, sample_test.duration
+        # Empty identity map: rec.test must come from the dashboard's own query
+        db_session.expunge_all()
+        sql_counter.clear()
+
+        response = _get_dashboard(client)
 
         assert response.status_code == 200
         data = response.get_json()
 
         assert len(data["recommended_tests"]) == 1
         assert data["recommended_tests"][0]["name"] == "Grapheme-Color Test"
-        assert data["recommended_tests"][0]["test_id"] == sample_test.id
+        assert data["recommended_tests"][0]["test_id"] == test_id
+        assert data["recommended_tests"][0]["duration"] == duration
+        assert not any(
+            q.startswith("SELECT") and "\nFROM tests \n" in q for q in sql_counter
+        )
 
     def test_dashboard_multiple_recommended_tests_ordered(
-        self, client, auth_participant, app
+        self, client, auth_participant, db_session
     ):
         """Test recommended tests are returned in position order"""
-        with app.app_context():
-            # Create screening
-            screening = ScreeningSession(
-                participant_id=auth_participant.id, status="completed", eligible=True
-            )
-            db.session.add(screening)
-            db.session.commit()
-
-            # Create tests
-            test1 = Test(name="Test 1", synesthesia_type="Type 1")
-            test2 = Test(name="Test 2", synesthesia_type="Type 2")
-            test3 = Test(name="Test 3", synesthesia_type="Type 3")
-            db.session.add_all([test1, test2, test3])
-            db.session.commit()
-
-            # Add recommendations in specific order
-            rec2 = ScreeningRecommendedTest(
-                session_id=screening.id,
-                position=2,
-                suggested_name="Test 2",
-                test_id=test2.id,
-            )
-            rec1 = ScreeningRecommendedTest(
-                session_id=screening.id,
-                position=1,
-                suggested_name="Test 1",
-                test_id=test1.id,
-            )
-            rec3 = ScreeningRecommendedTest(
-                session_id=screening.id,
-                position=3,
-                suggested_name="Test 3",
-                test_id=test3.id,
-            )
-            db.session.add_all([rec2, rec1, rec3])
-            db.session.commit()
-
-        response = client.get("/api/v1/participant/dashboard/")
+        screening = _make_screening(db_session, auth_participant.id)
+
+        # Create tests
+        test_ids = db_session.scalars(
+            insert(Test).returning(Test.id, sort_by_parameter_order=True),
+            [{"name": f"Test {n}", "synesthesia_type": f"Type {n}"} for n in (1, 2, 3)],
+        ).all()
+
+        # Add recommendations in specific order
+        _add_recs(
+            db_session,
+            screening.id,
+            [
+                {
+                    "position": n,
+                    "suggested_name": f"Test {n}",
+                    "test_id": test_ids[n - 1],
+                }
+                for n in (2, 1, 3)
+            ],
+        )
+        db_session.commit()
+
+        response = _get_dashboard(client)
         data = response.get_json()
 
         recs = data["recommended_tests"]
@@ -222,27 +299,25 @@ class TestDashboardColorTestIntegration:
         assert recs[2]["name"] == "Test 3"
 
     def test_dashboard_pending_tests_from_recommendations(
-        self, client, auth_participant, sample_test, app
+        self, client, auth_participant, sample_test, db_session
     ):
         """Test pending tests count includes unstarted recommended tests"""
-        with app.app_context():
-            # Create screening with recommendation
-            screening = ScreeningSession(
-                participant_id=auth_participant.id, status="completed", eligible=True
-            )
-            db.session.add(screening)
-            db.session.commit()
-
-            rec = ScreeningRecommendedTest(
-                session_id=screening.id,
-                position=1,
-                suggested_name="Color Test",
-                test_id=sample_test.id,
-            )
-            db.session.add(rec)
-            db.session.commit()
-
-        response = client.get("/api/v1/participant/dashboard/")
+        # Create screening with recommendation
+        screening = _make_screening(db_session, auth_participant.id)
+        _add_recs(
+            db_session,
+            screening.id,
+            [
+                {
+                    "position": 1,
+                    "suggested_name": "Color Test",
+                    "test_id": sample_test.id,
+                }
+            ],
+        )
+        db_session.commit()
+
+        response = _get_dashboard(client)
         data = response.get_json()
 
         # Should have 1 pending test from recommendation
@@ -250,7 +325,7 @@ class TestDashboardColorTestIntegration:
 
     def test_dashboard_user_info(self, client, auth_participant, sample_participant):
         """Test dashboard returns user information"""
-        response = client.get("/api/v1/participant/dashboard/")
+        response = _get_dashboard(client)
 
         assert response.status_code == 200
         data = response.get_json()
@@ -264,7 +339,7 @@ class TestDashboardColorTestIntegration:
         self, client, auth_researcher, sample_researcher
     ):
         """Test dashboard for researcher role"""
-        response = client.get("/api/v1/participant/dashboard/")
+        response = _get_dashboard(client)
 
         assert response.status_code == 200
         data = response.get_json()
@@ -278,60 +353,53 @@ class TestDashboardColorTestIntegration:
 class TestDashboardEdgeCases:
     """Test edge cases and error conditions"""
 
-    def test_dashboard_with_deleted_test_reference(self, client, auth_participant, app):
+    def test_dashboard_with_deleted_test_reference(
+        self, client, auth_participant, db_session
+    ):
         """Test dashboard handles deleted test references gracefully"""
-        with app.app_context():
-            # Create test result with non-existent test_id
-            result = TestResult(
-                participant_id=auth_participant.id,
-                test_id=99999,  # Non-existent
-                status="completed",
-            )
-            db.session.add(result)
-            db.session.commit()
+        # Create test result with non-existent test_id
+        result = TestResult(
+            participant_id=auth_participant.id,
+            test_id=99999,  # Non-existent
+            status="completed",
+        )
+        db_session.add(result)
+        db_session.commit()
 
-        response = client.get("/api/v1/participant/dashboard/")
+        response = _get_dashboard(client)
 
         # Should not crash
         assert response.status_code == 200
 
-    def test_dashboard_with_multiple_screenings(self, client, auth_participant, app):
+    def test_dashboard_with_multiple_screenings(
+        self, client, auth_participant, db_session
+    ):
         """Test dashboard uses latest completed screening"""
-        with app.app_context():
-            # Create older screening
-            old_screening = ScreeningSession(
-                participant_id=auth_participant.id,
-                status="completed",
-                eligible=True,
-                completed_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
-            )
-            db.session.add(old_screening)
-
-            # Create newer screening
-            new_screening = ScreeningSession(
-                participant_id=auth_participant.id,
-                status="completed",
-                eligible=True,
-                completed_at=datetime(2024, 12, 1, tzinfo=timezone.utc),
-            )
-            db.session.add(new_screening)
-            db.session.commit()
-
-            # Add recommendation only to new screening
-            test = Test(name="Latest Test", synesthesia_type="Color")
-            db.session.add(test)
-            db.session.commit()
-
-            rec = ScreeningRecommendedTest(
-                session_id=new_screening.id,
-                position=1,
-                suggested_name="Latest Test",
-                test_id=test.id,
-            )
-            db.session.add(rec)
-            db.session.commit()
-
-        response = client.get("/api/v1/participant/dashboard/")
+        # Create older and newer screenings
+        _make_screening(
+            db_session,
+            auth_participant.id,
+            completed_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        )
+        new_screening = _make_screening(
+            db_session,
+            auth_participant.id,
+            completed_at=datetime(2024, 12, 1, tzinfo=timezone.utc),
+        )
+
+        # Add recommendation only to new screening
+        test = Test(name="Latest Test", synesthesia_type="Color")
+        db_session.add(test)
+        db_session.flush()
+
+        _add_recs(
+            db_session,
+            new_screening.id,
+            [{"position": 1, "suggested_name": "Latest Test", "test_id": test.id}],
+        )
+        db_session.commit()
+
+        response = _get_dashboard(client)
         data = response.get_json()
 
         # Should show recommendation from latest screening
@@ -340,7 +408,7 @@ class TestDashboardEdgeCases:
 
     def test_dashboard_zero_division_protection(self, client, auth_participant):
         """Test dashboard handles zero total tests correctly"""
-        response = client.get("/api/v1/participant/dashboard/")
+        response = _get_dashboard(client)
         data = response.get_json()
 
         # Should not crash with division by zero
@@ -352,7 +420,7 @@ class TestDashboardEdgeCases:
             sess["user_id"] = 99999  # Non-existent user
             sess["user_role"] = "participant"
 
-        response = client.get("/api/v1/participant/dashboard/")
+        response = _get_dashboard(client)
 
         # Should return 404
         assert response.status_code == 404
@@ -365,29 +433,31 @@ class TestDashboardEdgeCases:
             sess["user_id"] = 99999  # Non-existent researcher
             sess["user_role"] = "researcher"
 
-        response = client.get("/api/v1/participant/dashboard/")
+        response = _get_dashboard(client)
 
         # Should return 404
         assert response.status_code == 404
         data = response.get_json()
         assert data["error"] == "User not found"
 
-    def test_dashboard_database_error_on_participant(self, client, monkeypatch):
+    def test_dashboard_database_error_on_participant(self, client, db_savepoint):
         """Test dashboard handles participant query errors"""
-        from models import Participant as P
+
+        def fail_participant_query(conn, cursor, statement, *args):
+            if "FROM participants" in statement:
+                raise Exception("Cannot connect to database")
 
         # Set up session first
         with client.session_transaction() as sess:
             sess["user_id"] = 1
             sess["user_role"] = "participant"
 
-        class BrokenQuery:
-            def get(self, user_id):
-                raise Exception("Cannot connect to database")
-
-        monkeypatch.setattr(P, "query", BrokenQuery())
-
-        response = client.get("/api/v1/participant/dashboard/")
+        # db_savepoint is the connection every session in this test runs on
+        event.listen(db_savepoint, "before_cursor_execute", fail_participant_query)
+        try:
+            response = _get_dashboard(client)
+        finally:
+            event.remove(db_savepoint, "before_cursor_execute", fail_participant_query)
 
         assert response.status_code == 500
         data = response.get_json()
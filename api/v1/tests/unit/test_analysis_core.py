@@ -17,6 +17,7 @@ sys.path.insert(
 
 from v1.analysis_core import (
     srgb_channel_to_linear,
+    channel255_to_linear,
     rgb255_to_linear,
     linear_rgb_to_xyz,
     xyz_to_luv,
@@ -31,6 +32,18 @@ from v1.analysis_core import (
 
 # Mock ColorTrial class for testing
 class MockColorTrial:
+    __slots__ = (
+        "id",
+        "meta_json",
+        "participant_id",
+        "response_ms",
+        "selected_b",
+        "selected_g",
+        "selected_r",
+        "stimulus_id",
+        "trial_index",
+    )
+
     def __init__(
         self,
         id=None,
@@ -54,6 +67,54 @@ class MockColorTrial:
         self.meta_json = meta_json or {}
 
 
+def _triplet_trials(rgbs_by_stimulus, response_ms=(None, None, None)):
+    """Three ordered MockColorTrials per stimulus, ids numbered from 1"""
+    trials = []
+    for stim_id, rgbs in rgbs_by_stimulus.items():
+        for i, ((r, g, b), rt) in enumerate(zip(rgbs, response_ms)):
+            trials.append(
+                MockColorTrial(
+                    id=len(trials) + 1,
+                    stimulus_id=stim_id,
+                    trial_index=i,
+                    selected_r=r,
+                    selected_g=g,
+                    selected_b=b,
+                    response_ms=rt,
+                )
+            )
+    return tuple(trials)
+
+
+@pytest.fixture(scope="module")
+def trial_pool():
+    """Read-only trial scenarios built once and shared by the analysis tests"""
+    stimuli = (1, 2, 3)
+    return {
+        "consistent_triplet": _triplet_trials(
+            {1: [(100, 150, 200), (102, 148, 198), (98, 152, 202)]},
+            response_ms=(500, 550, 520),
+        ),
+        "constant_triplet": _triplet_trials(
+            {1: [(100, 150, 200)] * 3}, response_ms=(500, 550, 520)
+        ),
+        "two_triggers": _triplet_trials(
+            {s: [(100 + s, 150 + s, 200 + s)] * 3 for s in (1, 2)}
+        ),
+        "red_ramp": _triplet_trials(
+            {s: [(100 + i * 10, 150 + s, 200) for i in range(3)] for s in stimuli}
+        ),
+        # Very consistent colors (small variation)
+        "near_identical": _triplet_trials(
+            {s: [(100, 100 + i, 100) for i in range(3)] for s in stimuli}
+        ),
+        # Completely different colors on each trial of every trigger
+        "rgb_primaries": _triplet_trials(
+            {s: [(255, 0, 0), (0, 255, 0), (0, 0, 255)] for s in stimuli}
+        ),
+    }
+
+
 class TestSrgbChannelToLinear:
     """Test sRGB to linear RGB channel conversion"""
 
@@ -81,6 +142,18 @@ class TestSrgbChannelToLinear:
         assert abs(result - expected) < 1e-10
 
 
+class TestChannel255ToLinear:
+    """Test 0-255 channel lookup against the sRGB formula"""
+
+    def test_table_matches_formula(self):
+        for c in range(256):
+            assert channel255_to_linear(c) == srgb_channel_to_linear(c / 255.0)
+
+    @pytest.mark.parametrize("c", [127.5, -1, 256])
+    def test_non_table_values_use_formula(self, c):
+        assert channel255_to_linear(c) == srgb_channel_to_linear(c / 255.0)
+
+
 class TestRgb255ToLinear:
     """Test RGB 0-255 to linear RGB conversion"""
 
@@ -221,6 +294,10 @@ class TestHexToRgb:
     def test_invalid_characters(self):
         assert hex_to_rgb("#gggggg") is None
 
+    @pytest.mark.parametrize("hexstr", ["ff 0a ", "+f+f+f", "f_f_f_"])
+    def test_non_hex_digits_rejected(self, hexstr):
+        assert hex_to_rgb(hexstr) is None
+
 
 class TestTrialRgbOrNone:
     """Test ColorTrial RGB extraction with various formats"""
@@ -252,6 +329,18 @@ class TestTrialRgbOrNone:
         result = trial_rgb_or_none(trial)
         assert result == (120, 180, 240)
 
+    @pytest.mark.parametrize(
+        "color",
+        [
+            {"R": 120, "G": 180, "B": 240},
+            {"red": 120, "green": 180, "blue": 240},
+            {"r": None, "R": 120, "g": 180, "green": 0, "B": 240},
+        ],
+    )
+    def test_nested_color_key_variants(self, color):
+        trial = MockColorTrial(meta_json={"selectedColor": color})
+        assert trial_rgb_or_none(trial) == (120, 180, 240)
+
     def test_no_color_data(self):
         trial = MockColorTrial(meta_json={})
         result = trial_rgb_or_none(trial)
@@ -308,37 +397,9 @@ class TestAnalyzeParticipantLogic:
         result = analyze_participant_logic([])
         assert result == {"error": "no_trials"}
 
-    def test_single_complete_trigger(self):
+    def test_single_complete_trigger(self, trial_pool):
         """Test analysis with one complete trigger (3 trials)"""
-        trials = [
-            MockColorTrial(
-                id=1,
-                stimulus_id=1,
-                trial_index=0,
-                selected_r=100,
-                selected_g=150,
-                selected_b=200,
-                response_ms=500,
-            ),
-            MockColorTrial(
-                id=2,
-                stimulus_id=1,
-                trial_index=1,
-                selected_r=102,
-                selected_g=148,
-                selected_b=198,
-                response_ms=550,
-            ),
-            MockColorTrial(
-                id=3,
-                stimulus_id=1,
-                trial_index=2,
-                selected_r=98,
-                selected_g=152,
-                selected_b=202,
-                response_ms=520,
-            ),
-        ]
+        trials = trial_pool["consistent_triplet"]
 
         result = analyze_participant_logic(trials)
 
@@ -410,88 +471,35 @@ class TestAnalyzeParticipantLogic:
 
         assert result["per_trigger"]["1"]["status"] == "no_color_present"
 
-    def test_multiple_triggers(self):
+    def test_multiple_triggers(self, trial_pool):
         """Test analysis with multiple triggers"""
-        trials = []
-        for stim_id in [1, 2]:
-            for i in range(3):
-                trials.append(
-                    MockColorTrial(
-                        id=len(trials) + 1,
-                        stimulus_id=stim_id,
-                        trial_index=i,
-                        selected_r=100 + stim_id,
-                        selected_g=150 + stim_id,
-                        selected_b=200 + stim_id,
-                    )
-                )
+        trials = trial_pool["two_triggers"]
 
         result = analyze_participant_logic(trials)
 
         assert len(result["per_trigger"]) == 2
         assert result["participant"]["n_valid_triggers"] == 2
 
-    def test_median_aggregation(self):
+    def test_median_aggregation(self, trial_pool):
         """Test using median instead of mean"""
-        trials = []
-        for stim_id in [1, 2, 3]:
-            for i in range(3):
-                trials.append(
-                    MockColorTrial(
-                        id=len(trials) + 1,
-                        stimulus_id=stim_id,
-                        trial_index=i,
-                        selected_r=100 + i * 10,
-                        selected_g=150 + stim_id,
-                        selected_b=200,
-                    )
-                )
+        trials = trial_pool["red_ramp"]
 
         result = analyze_participant_logic(trials, aggregate_method="median")
 
         assert result["participant"]["status"] == "ok"
         assert "participant_score" in result["participant"]
 
-    def test_synesthete_classification(self):
+    def test_synesthete_classification(self, trial_pool):
         """Test synesthete classification with consistent colors"""
-        trials = []
-        for stim_id in [1, 2, 3]:
-            for i in range(3):
-                # Very consistent colors (small variation)
-                trials.append(
-                    MockColorTrial(
-                        id=len(trials) + 1,
-                        stimulus_id=stim_id,
-                        trial_index=i,
-                        selected_r=100,
-                        selected_g=100 + i,
-                        selected_b=100,
-                    )
-                )
+        trials = trial_pool["near_identical"]
 
         result = analyze_participant_logic(trials, cutoff=135.0)
 
         assert result["participant"]["diagnosis"] == "synesthete"
 
-    def test_non_synesthete_classification(self):
+    def test_non_synesthete_classification(self, trial_pool):
         """Test non-synesthete classification with inconsistent colors"""
-        trials = []
-        # Use red, green, blue for first trigger (very different)
-        colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
-        for stim_id in [1, 2, 3]:
-            for i in range(3):
-                # Use completely different colors each trial
-                r, g, b = colors[i]
-                trials.append(
-                    MockColorTrial(
-                        id=len(trials) + 1,
-                        stimulus_id=stim_id,
-                        trial_index=i,
-                        selected_r=r,
-                        selected_g=g,
-                        selected_b=b,
-                    )
-                )
+        trials = trial_pool["rgb_primaries"]
 
         result = analyze_participant_logic(trials, cutoff=135.0)
 
@@ -530,71 +538,18 @@ class TestAnalyzeParticipantLogic:
 
         assert result["participant"]["status"] == "insufficient_data"
 
-    def test_response_time_tracking(self):
+    def test_response_time_tracking(self, trial_pool):
         """Test that response times are tracked"""
-        trials = [
-            MockColorTrial(
-                id=1,
-                stimulus_id=1,
-                trial_index=0,
-                selected_r=100,
-                selected_g=150,
-                selected_b=200,
-                response_ms=500,
-            ),
-            MockColorTrial(
-                id=2,
-                stimulus_id=1,
-                trial_index=1,
-                selected_r=100,
-                selected_g=150,
-                selected_b=200,
-                response_ms=550,
-            ),
-            MockColorTrial(
-                id=3,
-                stimulus_id=1,
-                trial_index=2,
-                selected_r=100,
-                selected_g=150,
-                selected_b=200,
-                response_ms=520,
-            ),
-        ]
+        trials = trial_pool["constant_triplet"]
 
         result = analyze_participant_logic(trials)
 
         assert result["participant"]["rt_mean"] is not None
         assert isinstance(result["participant"]["rt_mean"], int)
 
-    def test_representative_color(self):
+    def test_representative_color(self, trial_pool):
         """Test that representative color is calculated"""
-        trials = [
-            MockColorTrial(
-                id=1,
-                stimulus_id=1,
-                trial_index=0,
-                selected_r=100,
-                selected_g=150,
-                selected_b=200,
-            ),
-            MockColorTrial(
-                id=2,
-                stimulus_id=1,
-                trial_index=1,
-                selected_r=102,
-                selected_g=148,
-                selected_b=198,
-            ),
-            MockColorTrial(
-                id=3,
-                stimulus_id=1,
-                trial_index=2,
-                selected_r=98,
-                selected_g=152,
-                selected_b=202,
-            ),
-        ]
+        trials = trial_pool["consistent_triplet"]
 
         result = analyze_participant_logic(trials)
 
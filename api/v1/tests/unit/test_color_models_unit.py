@@ -0,0 +1,254 @@
+"""
+Pure-Python model tests: to_dict(), repr, properties and consistency scores
+on unsaved instances. Marked no_db, so no tables are created for them.
+"""
+
+import os
+import sys
+from datetime import UTC, datetime
+
+import pytest
+
+# Add parent directories to path to access api modules
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+)
+
+from models import (
+    AnalyzedTestData,
+    ColorStimulus,
+    ScreeningTestData,
+    SpeedCongruency,
+    TestData,
+)
+
+pytestmark = pytest.mark.no_db
+
+# Foreign keys are never checked: nothing here is flushed
+PARTICIPANT_ID = 1
+
+
+class TestTestDataModel:
+    """Tests for TestData model"""
+
+    def test_test_data_get_consistency_score(self):
+        """Test get_consistency_score method"""
+        data1 = TestData(user_id="P_TEST", cct_mean=100.0, cct_std=10.0)
+        score1 = data1.get_consistency_score()
+        assert score1 == 0.9
+
+    def test_test_data_get_consistency_score_none(self):
+        """Test get_consistency_score when cct_mean is None - hits line 300"""
+        data = TestData(user_id="P_TEST", cct_mean=None, cct_std=10.0)
+        score = data.get_consistency_score()
+        assert score is None
+
+    def test_test_data_get_consistency_score_zero_mean(self):
+        """Test get_consistency_score when cct_mean is 0 - hits line 300"""
+        data = TestData(user_id="P_TEST", cct_mean=0.0, cct_std=10.0)
+        score = data.get_consistency_score()
+        assert score is None
+
+    def test_test_data_to_dict(self):
+        """Test to_dict method"""
+        data = TestData(user_id="P_TEST", test_type="cct", cct_mean=75.0, cct_pass=True)
+
+        result = data.to_dict()
+        assert result["user_id"] == "P_TEST"
+
+
+class TestColorStimulusModel:
+    """Tests for ColorStimulus model to hit line 341 (pure Python, never persisted)"""
+
+    def test_color_stimulus_distance_to(self):
+        """Test distance_to method - hits line 341"""
+        stimulus = ColorStimulus(
+            r=255,
+            g=0,
+            b=0,
+            owner_researcher_id=1,
+            trigger_type="letter_a",
+        )
+        # Test distance calculation
+        distance = stimulus.distance_to(255, 255, 0)
+        assert distance == 255.0  # Distance from red to yellow
+
+    def test_color_stimulus_hex_color(self):
+        """Test hex_color property"""
+        stimulus = ColorStimulus(r=255, g=128, b=64, owner_researcher_id=1)
+        # Test hex color property
+        assert stimulus.hex_color == "#ff8040"
+
+    @pytest.mark.parametrize(
+        "rgb,expected",
+        [((0, 0, 0), "#000000"), ((300, 0, 15), "#12c000f"), ((-1, 0, 0), "#-10000")],
+        ids=["black", "above-range", "negative"],
+    )
+    def test_color_stimulus_hex_color_outside_lookup(self, rgb, expected):
+        """Channels outside 0..255 format the same way the f-string always did"""
+        r, g, b = rgb
+        assert ColorStimulus(r=r, g=g, b=b).hex_color == expected
+
+    def test_color_stimulus_rgb_tuple(self):
+        """Test rgb_tuple property"""
+        stimulus = ColorStimulus(r=100, g=150, b=200, owner_researcher_id=1)
+        # Test rgb tuple property
+        assert stimulus.rgb_tuple == (100, 150, 200)
+
+    def test_color_stimulus_to_dict(self):
+        """Test to_dict method"""
+        stimulus = ColorStimulus(
+            r=50,
+            g=100,
+            b=150,
+            owner_researcher_id=1,
+            trigger_type="test",
+        )
+        result = stimulus.to_dict()
+        assert result["r"] == 50
+        assert result["g"] == 100
+        assert result["b"] == 150
+        assert result["hex"] == "#326496"
+
+
+class TestScreeningTestDataModel:
+    """CRITICAL: Tests for ScreeningTestData - targeting lines 530-578
+
+    to_dict()/repr only read attributes, so these rows are never persisted.
+    """
+
+    def test_screening_test_data_repr(self):
+        """Test __repr__ method"""
+        test_data = ScreeningTestData(
+            user_id=PARTICIPANT_ID, test_code="GC-SCT", status="completed"
+        )
+
+        repr_str = repr(test_data)
+        assert "<ScreeningTestData" in repr_str
+
+    def test_screening_test_data_to_dict_all_populated_timestamps(self):
+        """CRITICAL: Test to_dict with ALL timestamps populated (hits lines 536-539, 545-548, 553-558, 563-570, 575)"""
+        now = datetime.now(UTC)
+        test_data = ScreeningTestData(
+            user_id=PARTICIPANT_ID,
+            test_code="GC-SCT",
+            version="2.0",
+            started_at=now,
+            completed_at=now,
+            created_at=now,
+            status="completed",
+            rt_mean_ms=500,
+            accuracy=0.95,
+            consistency_score=0.85,
+            result_label="Likely synesthete",
+            likelihood_score=0.9,
+            recommendation="Continue testing",
+        )
+
+        result = test_data.to_dict()
+
+        # These should all be ISO format strings
+        assert result["started_at"] is not None
+        assert isinstance(result["started_at"], str)
+        assert result["completed_at"] is not None
+        assert isinstance(result["completed_at"], str)
+        assert result["created_at"] is not None
+        assert isinstance(result["created_at"], str)
+
+        # Check all other fields
+        assert result["user_id"] == PARTICIPANT_ID
+        assert result["test_code"] == "GC-SCT"
+        assert result["version"] == "2.0"
+        assert result["status"] == "completed"
+        assert result["rt_mean_ms"] == 500
+        assert result["accuracy"] == 0.95
+        assert result["consistency_score"] == 0.85
+        assert result["result_label"] == "Likely synesthete"
+        assert result["likelihood_score"] == 0.9
+        assert result["recommendation"] == "Continue testing"
+
+    @pytest.mark.parametrize(
+        "started,completed",
+        [(False, False), (True, False), (False, True)],
+        ids=["all_none", "mixed", "reverse_mixed"],
+    )
+    def test_screening_test_data_to_dict_timestamps(self, started, completed):
+        """CRITICAL: Test to_dict timestamp permutations (hits lines 535, 544, 552, 562, 574)"""
+        now = datetime.now(UTC)
+        test_data = ScreeningTestData(
+            user_id=PARTICIPANT_ID,
+            test_code="GC-SCT",
+            started_at=now if started else None,
+            completed_at=now if completed else None,
+        )
+
+        result = test_data.to_dict()
+
+        assert (result["started_at"] is not None) is started
+        assert (result["completed_at"] is not None) is completed
+        assert result["user_id"] == PARTICIPANT_ID
+        assert result["test_code"] == "GC-SCT"
+
+    def test_screening_test_data_to_dict_minimal_fields(self):
+        """Test to_dict with only required fields"""
+        test_data = ScreeningTestData(user_id=PARTICIPANT_ID, test_code="MINIMAL")
+
+        result = test_data.to_dict()
+
+        assert result["test_code"] == "MINIMAL"
+        assert result["version"] is None
+        assert result["status"] is None
+
+
+class TestSpeedCongruencyModel:
+    """Tests for SpeedCongruency model"""
+
+    def test_speed_congruency_to_dict(self):
+        """Test to_dict method"""
+        speed = SpeedCongruency(
+            participant_id="P_TEST",
+            trial_index=1,
+            cue_word="TEST",
+            chosen_name="red",
+            matched=True,
+            response_ms=500,
+        )
+
+        result = speed.to_dict()
+        assert result["participant_id"] == "P_TEST"
+
+
+class TestAnalyzedTestDataModel:
+    """Tests for AnalyzedTestData model"""
+
+    def test_analyzed_test_data_to_dict(self):
+        """Test to_dict method"""
+        analyzed = AnalyzedTestData(
+            user_id=PARTICIPANT_ID,
+            test_type="color_consistency",
+            family="color",
+            diagnosis=True,
+        )
+
+        result = analyzed.to_dict()
+        assert result["diagnosis"] is True
+
+
+class TestMissingLinesCritical:
+    """CRITICAL: Additional tests to push from 94% to 95%"""
+
+    @pytest.mark.parametrize(
+        "mean,std,expect_none",
+        [
+            (50.0, None, True),  # cct_std is None
+            (-10.0, 5.0, True),  # cct_mean is negative
+            (None, None, True),  # both None
+            # std > mean: negative is clamped to 0 by min function
+            (10.0, 50.0, False),
+        ],
+        ids=["std_none", "negative_mean", "both_none", "std_gt_mean"],
+    )
+    def test_consistency_score_edge_cases(self, mean, std, expect_none):
+        """Edge cases for TestData.get_consistency_score"""
+        data = TestData(user_id="P_TEST", cct_mean=mean, cct_std=std)
+        assert (data.get_consistency_score() is None) is expect_none
@@ -11,393 +11,293 @@ Target: 95%+ coverage for seed_speed_congruency.py
 """
 
 import pytest
-import sys
-import os
+from types import SimpleNamespace
 
-# Add parent directories to path to access api modules
-sys.path.insert(
-    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
-)
-
-from flask import Flask
+from sqlalchemy import func, select
+from sqlalchemy.orm import raiseload
 from models import db, Participant, ColorStimulus, TestData
+from seed_speed_congruency import seed
 from werkzeug.security import check_password_hash
 
+SEED_EMAIL = "speedtest@example.com"
+# description -> (r, g, b) of the stimuli seed() creates
+SEED_STIMULI = {
+    "SUN": (255, 223, 0),
+    "MOON": (135, 206, 235),
+    "MUSIC": (144, 238, 144),
+    "MONDAY": (255, 105, 180),
+}
+
+
+@pytest.fixture(autouse=True)
+def setup_database(db_savepoint):
+    """Roll back each test's seeded rows instead of rebuilding the database"""
+    yield
+
+
+def _seed_user_key():
+    """TestData.user_id the seed writes: the seeded participant's id as a string"""
+    return str(
+        db.session.scalar(select(Participant.id).where(Participant.email == SEED_EMAIL))
+    )
 
-@pytest.fixture
-def app():
-    """Create Flask app for testing"""
-    app = Flask(__name__)
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["TESTING"] = True
-    app.config["SECRET_KEY"] = "test-secret-key"
 
-    db.init_app(app)
+def _count(model, *where):
+    """COUNT(*) of the model's rows matching where, without loading them"""
+    return db.session.scalar(select(func.count()).select_from(model).where(*where))
 
+
+def _color_test_data(user_key, **filters):
+    """A user's color TestData rows; touching a relationship raises instead of loading"""
+    return db.session.scalars(
+        select(TestData)
+        .options(raiseload("*"))
+        .filter_by(user_id=user_key, family="color", **filters)
+    ).all()
+
+
+@pytest.fixture(scope="class")
+def seeded_user(app, db_connection):
+    """Run seed() once in the class's outer transaction; rolled back with it"""
+    seed(app)
     with app.app_context():
-        db.create_all()
-        yield app
-        db.session.remove()
-        db.drop_all()
+        user_key = _seed_user_key()
+    return SimpleNamespace(id=int(user_key), user_key=user_key, email=SEED_EMAIL)
 
 
 class TestSeedSpeedCongruency:
-    """Test seed_speed_congruency.py seeding function"""
+    """Test seed_speed_congruency.py seeding function; each test starts empty"""
 
     def test_seed_creates_participant(self, app):
         """Test seed creates participant if not exists"""
-        # Import seed function inside app context
-        with app.app_context():
-            from seed_speed_congruency import seed
-
-            # Ensure participant doesn't exist
-            existing = Participant.query.filter_by(
-                email="speedtest@example.com"
-            ).first()
-            if existing:
-                db.session.delete(existing)
-                db.session.commit()
-
-            # Run seed
-            seed(app)
+        # Run seed
+        seed(app)
 
-            # Verify participant created
-            participant = Participant.query.filter_by(
-                email="speedtest@example.com"
-            ).first()
-            assert participant is not None
-            assert participant.name == "Speed Test User"
-            assert participant.age == 21
-            assert participant.country == "Spain"
-            assert check_password_hash(participant.password_hash, "test1234")
+        # Verify participant created
+        participant = Participant.query.filter_by(email="speedtest@example.com").first()
+        assert participant is not None
+        assert participant.name == "Speed Test User"
+        assert participant.age == 21
+        assert participant.country == "Spain"
+        assert check_password_hash(participant.password_hash, "test1234")
 
     def test_seed_finds_existing_participant(self, app):
         """Test seed finds existing participant instead of creating duplicate"""
-        with app.app_context():
-            # Create participant manually
-            from werkzeug.security import generate_password_hash
-
-            p = Participant(
-                name="Speed Test User",
-                email="speedtest@example.com",
-                password_hash=generate_password_hash("test1234"),
-                age=21,
-                country="Spain",
-            )
-            db.session.add(p)
-            db.session.commit()
-            original_id = p.id
-
-            from seed_speed_congruency import seed
-
-            # Run seed (should not create duplicate)
-            seed(app)
-
-            # Verify only one participant exists with same ID
-            participants = Participant.query.filter_by(
-                email="speedtest@example.com"
-            ).all()
-            assert len(participants) == 1
-            assert participants[0].id == original_id
-
-    def test_seed_creates_color_stimuli(self, app):
-        """Test seed creates all expected color stimuli"""
-        with app.app_context():
-            # Clean up existing stimuli
-            ColorStimulus.query.filter(
-                ColorStimulus.description.in_(["SUN", "MOON", "MUSIC", "MONDAY"])
-            ).delete()
-            db.session.commit()
-
-            from seed_speed_congruency import seed
-
-            seed(app)
-
-            # Verify all 4 stimuli created
-            sun = ColorStimulus.query.filter_by(description="SUN").first()
-            assert sun is not None
-            assert sun.r == 255
-            assert sun.g == 223
-            assert sun.b == 0
-
-            moon = ColorStimulus.query.filter_by(description="MOON").first()
-            assert moon is not None
-            assert moon.r == 135
-            assert moon.g == 206
-            assert moon.b == 235
-
-            music = ColorStimulus.query.filter_by(description="MUSIC").first()
-            assert music is not None
-            assert music.r == 144
-            assert music.g == 238
-            assert music.b == 144
-
-            monday = ColorStimulus.query.filter_by(description="MONDAY").first()
-            assert monday is not None
-            assert monday.r == 255
-            assert monday.g == 105
-            assert monday.b == 180
+        # Create participant manually
+        from werkzeug.security import generate_password_hash
+
+        p = Participant(
+            name="Speed Test User",
+            email="speedtest@example.com",
+            password_hash=generate_password_hash("test1234"),
+            age=21,
+            country="Spain",
+        )
+        db.session.add(p)
+        db.session.commit()
+        original_id = p.id
+
+        # Run seed (should not create duplicate)
+        seed(app)
+
+        # Verify only one participant exists with same ID
+        participant_ids = db.session.scalars(
+            select(Participant.id).where(Participant.email == SEED_EMAIL)
+        ).all()
+        assert participant_ids == [original_id]
 
     def test_seed_finds_existing_stimuli(self, app):
         """Test seed finds existing stimuli instead of creating duplicates"""
-        with app.app_context():
-            # Create one stimulus manually
-            stim = ColorStimulus(
-                description="SUN",
-                r=255,
-                g=223,
-                b=0,
-                family="color",
-                trigger_type="word",
-            )
-            db.session.add(stim)
-            db.session.commit()
-            original_id = stim.id
-
-            from seed_speed_congruency import seed
-
-            seed(app)
-
-            # Verify no duplicate created
-            sun_stimuli = ColorStimulus.query.filter_by(
-                description="SUN", r=255, g=223, b=0
-            ).all()
-            assert len(sun_stimuli) == 1
-            assert sun_stimuli[0].id == original_id
+        # Create one stimulus manually
+        stim = ColorStimulus(
+            description="SUN",
+            r=255,
+            g=223,
+            b=0,
+            family="color",
+            trigger_type="word",
+        )
+        db.session.add(stim)
+        db.session.commit()
+        original_id = stim.id
+
+        seed(app)
+
+        # Verify no duplicate created
+        sun_ids = db.session.scalars(
+            select(ColorStimulus.id).filter_by(description="SUN", r=255, g=223, b=0)
+        ).all()
+        assert sun_ids == [original_id]
 
     def test_seed_creates_test_data(self, app):
         """Test seed creates TestData for each stimulus"""
-        with app.app_context():
-            # Clean up
-            TestData.query.filter(TestData.family == "color").delete()
-            db.session.commit()
+        seed(app)
 
-            from seed_speed_congruency import seed
+        # Get participant
+        user_key = _seed_user_key()
 
-            seed(app)
+        # Verify TestData created for all 4 stimuli
+        test_data = _color_test_data(user_key)
+        assert len(test_data) >= 4
 
-            # Get participant
-            participant = Participant.query.filter_by(
-                email="speedtest@example.com"
-            ).first()
-            user_key = str(participant.id)
-
-            # Verify TestData created for all 4 stimuli
-            test_data = TestData.query.filter_by(user_id=user_key, family="color").all()
-            assert len(test_data) >= 4
-
-            # Check one TestData record in detail
-            td = test_data[0]
-            assert td.family == "color"
-            assert td.cct_valid == 1
-            assert td.cct_pass is True
-            assert td.cct_trials_per_trigger == 3
-            assert td.cct_none_pct == 0.0
-
-    def test_seed_test_data_links_to_stimuli(self, app):
-        """Test TestData records link to correct stimuli"""
-        with app.app_context():
-            from seed_speed_congruency import seed
-
-            seed(app)
-
-            participant = Participant.query.filter_by(
-                email="speedtest@example.com"
-            ).first()
-            user_key = str(participant.id)
-
-            # Get SUN stimulus
-            sun_stim = ColorStimulus.query.filter_by(description="SUN").first()
-
-            # Find TestData for SUN
-            td = TestData.query.filter_by(
-                user_id=user_key, stimulus_id=sun_stim.id, family="color"
-            ).first()
-            assert td is not None
-            assert td.stimulus_id == sun_stim.id
+        # Check one TestData record in detail
+        td = test_data[0]
+        assert td.family == "color"
+        assert td.cct_valid == 1
+        assert td.cct_pass is True
+        assert td.cct_trials_per_trigger == 3
+        assert td.cct_none_pct == 0.0
 
     def test_seed_does_not_duplicate_test_data(self, app):
         """Test seed doesn't create duplicate TestData"""
-        with app.app_context():
-            from seed_speed_congruency import seed
+        # Run seed twice
+        seed(app)
+        seed(app)
+
+        user_key = _seed_user_key()
+
+        # Get one stimulus
+        sun_id = db.session.scalar(
+            select(ColorStimulus.id).where(ColorStimulus.description == "SUN")
+        )
+
+        # Verify only one TestData exists
+        sun_rows = _count(
+            TestData,
+            TestData.user_id == user_key,
+            TestData.stimulus_id == sun_id,
+            TestData.family == "color",
+        )
+        assert sun_rows == 1
 
-            # Run seed twice
-            seed(app)
+    def test_seed_can_run_multiple_times(self, app):
+        """Test seed is idempotent - can run multiple times safely"""
+        # Run seed 3 times
+        seed(app)
+        seed(app)
+        seed(app)
+
+        # Should still have exactly 1 participant
+        assert _count(Participant, Participant.email == SEED_EMAIL) == 1
+
+        # Should have exactly 4 stimuli
+        stimuli = _count(ColorStimulus, ColorStimulus.description.in_(SEED_STIMULI))
+        assert stimuli == 4
+
+        # Should have exactly 4 TestData records
+        user_key = _seed_user_key()
+        test_data = _count(
+            TestData, TestData.user_id == user_key, TestData.family == "color"
+        )
+        assert test_data == 4
+
+    def test_seed_is_constant_queries(self, app, sql_counter):
+        """Test seed reads a fixed number of times however many rows it creates"""
+        seed(app)
+        seed(app)
+
+        selects = [s for s in sql_counter if s.startswith("SELECT")]
+        inserts = [s for s in sql_counter if s.startswith("INSERT")]
+        # Participant, stimuli and TestData links: one lookup each per run, plus
+        # the first run's reload of the participant its commit expired
+        assert len(selects) == 2 * 3 + 1
+        # Only the first run writes: the participant, then each stimulus and its link
+        assert len(inserts) == 1 + 2 * len(SEED_STIMULI)
+
+    def test_seed_cleans_up_on_error(self, app):
+        """Test seed handles errors gracefully"""
+        # This test validates the function doesn't crash
+        # Even if some data exists, seed should complete
+        try:
             seed(app)
+            assert True  # Seed completed without exception
+        except Exception as e:
+            pytest.fail(f"Seed should not raise exception: {e}")
 
-            participant = Participant.query.filter_by(
-                email="speedtest@example.com"
-            ).first()
-            user_key = str(participant.id)
 
-            # Get one stimulus
-            sun_stim = ColorStimulus.query.filter_by(description="SUN").first()
+@pytest.mark.usefixtures("seeded_user")
+class TestSeededData:
+    """Read-only checks against one seed() run shared by the whole class"""
 
-            # Verify only one TestData exists
-            test_data = TestData.query.filter_by(
-                user_id=user_key, stimulus_id=sun_stim.id, family="color"
-            ).all()
-            assert len(test_data) == 1
+    def test_seed_test_data_links_to_stimuli(self, seeded_user):
+        """Test TestData records link to correct stimuli"""
+        user_key = seeded_user.user_key
 
-    def test_seed_test_data_marks_as_valid(self, app):
-        """Test TestData is marked as valid association"""
-        with app.app_context():
-            from seed_speed_congruency import seed
+        # Get SUN stimulus
+        sun_stim = ColorStimulus.query.filter_by(description="SUN").first()
 
-            seed(app)
+        # Find TestData for SUN
+        (td,) = _color_test_data(user_key, stimulus_id=sun_stim.id)
+        assert td.stimulus_id == sun_stim.id
 
-            participant = Participant.query.filter_by(
-                email="speedtest@example.com"
-            ).first()
-            user_key = str(participant.id)
+    def test_seed_test_data_marks_as_valid(self, seeded_user):
+        """Test TestData is marked as valid association"""
+        user_key = seeded_user.user_key
 
-            # Get all test data
-            test_data = TestData.query.filter_by(user_id=user_key, family="color").all()
+        # Get all test data
+        test_data = _color_test_data(user_key)
 
-            # All should be marked as valid
-            for td in test_data:
-                assert td.cct_valid == 1
-                assert td.cct_pass is True
+        # All should be marked as valid
+        for td in test_data:
+            assert td.cct_valid == 1
+            assert td.cct_pass is True
 
-    def test_seed_sets_correct_test_type(self, app):
+    def test_seed_sets_correct_test_type(self, seeded_user):
         """Test TestData has correct test_type and stimulus_type"""
-        with app.app_context():
-            from seed_speed_congruency import seed
-
-            seed(app)
+        user_key = seeded_user.user_key
 
-            participant = Participant.query.filter_by(
-                email="speedtest@example.com"
-            ).first()
-            user_key = str(participant.id)
+        test_data = _color_test_data(user_key)
 
-            test_data = TestData.query.filter_by(user_id=user_key, family="color").all()
+        for td in test_data:
+            assert td.test_type == "color-word"
+            assert td.stimulus_type == "word"
 
-            for td in test_data:
-                assert td.test_type == "color-word"
-                assert td.stimulus_type == "word"
-
-    def test_seed_sets_color_metrics(self, app):
+    def test_seed_sets_color_metrics(self, seeded_user):
         """Test TestData has correct color consistency metrics"""
-        with app.app_context():
-            from seed_speed_congruency import seed
-
-            seed(app)
-
-            participant = Participant.query.filter_by(
-                email="speedtest@example.com"
-            ).first()
-            user_key = str(participant.id)
-
-            test_data = TestData.query.filter_by(user_id=user_key, family="color").all()
-
-            for td in test_data:
-                assert td.cct_cutoff == 0.1
-                assert td.cct_triggers == 1
-                assert td.cct_trials_per_trigger == 3
-                assert td.cct_rt_mean == 1000
-                assert td.cct_mean == 0.05
-                assert td.cct_std == 0.01
-                assert td.cct_median == 0.05
-
-    def test_seed_stimulus_has_correct_family(self, app):
-        """Test ColorStimulus has correct family and trigger_type"""
-        with app.app_context():
-            from seed_speed_congruency import seed
+        user_key = seeded_user.user_key
 
-            seed(app)
-
-            stimuli = ColorStimulus.query.filter(
-                ColorStimulus.description.in_(["SUN", "MOON", "MUSIC", "MONDAY"])
-            ).all()
-
-            for stim in stimuli:
-                assert stim.family == "color"
-                assert stim.trigger_type == "word"
+        test_data = _color_test_data(user_key)
 
-    def test_seed_can_run_multiple_times(self, app):
-        """Test seed is idempotent - can run multiple times safely"""
-        with app.app_context():
-            from seed_speed_congruency import seed
-
-            # Run seed 3 times
-            seed(app)
-            seed(app)
-            seed(app)
-
-            # Should still have exactly 1 participant
-            participants = Participant.query.filter_by(
-                email="speedtest@example.com"
-            ).all()
-            assert len(participants) == 1
-
-            # Should have exactly 4 stimuli
-            stimuli = ColorStimulus.query.filter(
-                ColorStimulus.description.in_(["SUN", "MOON", "MUSIC", "MONDAY"])
-            ).all()
-            assert len(stimuli) == 4
-
-            # Should have exactly 4 TestData records
-            participant = participants[0]
-            user_key = str(participant.id)
-            test_data = TestData.query.filter_by(user_id=user_key, family="color").all()
-            assert len(test_data) == 4
-
-    def test_seed_participant_has_participant_id(self, app):
+        for td in test_data:
+            assert td.cct_cutoff == 0.1
+            assert td.cct_triggers == 1
+            assert td.cct_trials_per_trigger == 3
+            assert td.cct_rt_mean == 1000
+            assert td.cct_mean == 0.05
+            assert td.cct_std == 0.01
+            assert td.cct_median == 0.05
+
+    @pytest.mark.parametrize("desc,rgb", SEED_STIMULI.items())
+    def test_seed_stimulus_properties(self, desc, rgb):
+        """Test each seeded stimulus exists once with its color and family"""
+        (stim,) = db.session.scalars(
+            select(ColorStimulus)
+            .options(raiseload("*"))
+            .where(ColorStimulus.description == desc)
+        ).all()
+        assert (stim.r, stim.g, stim.b) == rgb
+        assert stim.family == "color"
+        assert stim.trigger_type == "word"
+
+    def test_seed_participant_has_participant_id(self):
         """Test seeded participant has participant_id field set"""
-        with app.app_context():
-            from seed_speed_congruency import seed
-
-            seed(app)
-
-            participant = Participant.query.filter_by(
-                email="speedtest@example.com"
-            ).first()
-            assert participant.participant_id is not None
-            assert isinstance(participant.participant_id, str)
-
-    def test_seed_stimulus_colors_are_distinct(self, app):
-        """Test each stimulus has a unique color combination"""
-        with app.app_context():
-            from seed_speed_congruency import seed
+        participant = Participant.query.filter_by(email="speedtest@example.com").first()
+        assert participant.participant_id is not None
+        assert isinstance(participant.participant_id, str)
 
-            seed(app)
-
-            stimuli = ColorStimulus.query.filter(
-                ColorStimulus.description.in_(["SUN", "MOON", "MUSIC", "MONDAY"])
-            ).all()
-
-            # Create set of (r, g, b) tuples
-            colors = {(s.r, s.g, s.b) for s in stimuli}
-            assert len(colors) == 4  # All colors are unique
-
-    def test_seed_test_data_has_created_at(self, app):
+    def test_seed_test_data_has_created_at(self, seeded_user):
         """Test TestData has created_at timestamp"""
-        with app.app_context():
-            from seed_speed_congruency import seed
+        user_key = seeded_user.user_key
 
-            seed(app)
+        test_data = _color_test_data(user_key)
 
-            participant = Participant.query.filter_by(
-                email="speedtest@example.com"
-            ).first()
-            user_key = str(participant.id)
+        for td in test_data:
+            assert td.created_at is not None
 
-            test_data = TestData.query.filter_by(user_id=user_key, family="color").all()
+    def test_seed_rerun_query_count(self, app, sql_counter):
+        """Test re-running seed only looks rows up, with no per-row lazy loads"""
+        seed(app)
 
-            for td in test_data:
-                assert td.created_at is not None
-
-    def test_seed_cleans_up_on_error(self, app):
-        """Test seed handles errors gracefully"""
-        # This test validates the function doesn't crash
-        with app.app_context():
-            from seed_speed_congruency import seed
-
-            # Even if some data exists, seed should complete
-            try:
-                seed(app)
-                assert True  # Seed completed without exception
-            except Exception as e:
-                pytest.fail(f"Seed should not raise exception: {e}")
+        # Participant, stimuli and existing TestData links: one lookup each
+        assert len([s for s in sql_counter if s.startswith("SELECT")]) == 3
+        assert not [s for s in sql_counter if s.startswith(("INSERT", "UPDATE"))]
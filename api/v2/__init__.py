@@ -1,14 +1,5 @@
-from flask import Blueprint
 import common
-
-# =====================================
-# IMPORTING ENDPOINTS
-# =====================================
-from .dashboard import bp as dashboard_bp
-from .colortest import bp as colortest_bp
-from .screening import bp as screening_bp
-from .researcher_dashboard import bp as researcher_dashboard_bp
-from .speedcongruency import bp as speedcongruency_bp
+from flask import Blueprint
 
 # =====================================
 # Setup blueprint
@@ -18,11 +9,10 @@ bp_v2 = Blueprint("api_v2", __name__)
 # =====================================
 # REGISTERING ENDPOINTS
 # =====================================
-bp_v2.register_blueprint(dashboard_bp, url_prefix="participant/dashboard")
-bp_v2.register_blueprint(colortest_bp, url_prefix="/tests/color/")
-bp_v2.register_blueprint(screening_bp, url_prefix="/screening/")
-bp_v2.register_blueprint(researcher_dashboard_bp, url_prefix="/researcher/dashboard")
-bp_v2.register_blueprint(speedcongruency_bp, url_prefix="/speedcongruency")
+# Only the auth routes below exist in v2 so far. Endpoint blueprints
+# (dashboard, colortest, screening, ...) get registered on bp_v2 here
+# once their modules land.
+
 
 # =====================================
 # AUTHENTICATION ENDPOINTS